@@ -6,20 +6,39 @@ import logging
 
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
 from .pyactron.appliance import Appliance
+from .pyactron.command_journal import CommandJournal
+from .pyactron.discovery import DiscoveredController
+from .pyactron.exceptions import ActronException
 
 from .pyactron.service_configuration import ServiceConfiguration
 from .pyactron.actron_user import ActronUser
 
-from .const import CONF_SERVICE_CONFIGURATION, CONF_USER
+from .const import (
+    CONF_BLOCK_ID,
+    CONF_CONTROLLER,
+    CONF_MQTT_BRIDGE,
+    CONF_MQTT_TOPIC_PREFIX,
+    CONF_SERVICE_CONFIGURATION,
+    CONF_USER,
+    DEFAULT_MQTT_TOPIC_PREFIX,
+    DOMAIN,
+    STORAGE_VERSION,
+)
 from .coordinator import ActronConfigEntry, ActronCoordinator
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 _PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.SWITCH, Platform.CLIMATE]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 
 def _recreate_service_configuration(service_config_data: dict, session) -> ServiceConfiguration:
     """Recreate ServiceConfiguration object from stored data."""
@@ -31,6 +50,12 @@ def _recreate_actron_user(user_data: dict) -> ActronUser:
     return ActronUser.from_dict(user_data)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the actron_connect integration."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ActronConfigEntry) -> bool:
     """Set up actron_connect from a config entry."""
     conf = entry.data
@@ -44,19 +69,48 @@ async def async_setup_entry(hass: HomeAssistant, entry: ActronConfigEntry) -> bo
     # recreate the user from stored data
     user = _recreate_actron_user(conf[CONF_USER])
 
-    # refreshing the service configuration after restarts to make sure it is up to date
-    await service_configuration.refresh_configuration()
-
     # fix up the entry title now that the device details are loaded
     hass.config_entries.async_update_entry(entry, title=user.aircon_block_id)
 
     # create the appliance
-    device = Appliance(host, service_configuration, user, session)
-    await device.init()
+    device = Appliance(host, service_configuration, user, session, CommandJournal())
+
+    # restore the commands kept while the Ninja service was unreachable, before the state
+    # so it shows them
+    journal_store = Store[dict](hass, STORAGE_VERSION, _journal_storage_key(entry))
+    if commands := await journal_store.async_load():
+        device.command_journal.restore(commands)
+
+    # restore the state persisted before the last restart, if any
+    store = Store[dict](hass, STORAGE_VERSION, _storage_key(entry))
+    snapshot = await store.async_load()
+    if snapshot:
+        try:
+            device.restore(snapshot)
+        except (KeyError, TypeError) as e:
+            _LOGGER.warning("Ignoring invalid state snapshot for %s: %s", user.aircon_block_id, e)
+            snapshot = None
 
     # create the coordinator
-    coordinator = ActronCoordinator(hass, entry, device)
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = ActronCoordinator(hass, entry, device, store, journal_store)
+
+    if snapshot:
+        # entities are populated from the snapshot straight away, live data replaces it
+        # once the device has been initialized in the background
+        entry.async_create_background_task(
+            hass, _async_initialize_device(coordinator, snapshot["block_id"]), f"{DOMAIN} initialize {device.device_id}"
+        )
+    else:
+        # refreshing the service configuration after restarts to make sure it is up to date
+        await service_configuration.refresh_configuration()
+        # the config flow hands over the controller details once, later they come from the snapshot
+        controller = DiscoveredController(**conf[CONF_CONTROLLER]) if CONF_CONTROLLER in conf else None
+        await device.init(conf.get(CONF_BLOCK_ID), controller)
+        await coordinator.async_config_entry_first_refresh()
+        if controller is not None:
+            hass.config_entries.async_update_entry(
+                entry, data={key: value for key, value in conf.items() if key != CONF_CONTROLLER}
+            )
 
     # store the coordinator in the entry
     entry.runtime_data = coordinator
@@ -64,9 +118,65 @@ async def async_setup_entry(hass: HomeAssistant, entry: ActronConfigEntry) -> bo
     # forward the entry to the platforms
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
 
+    # keep a connection to the cloud service open for a while after commands, so follow-up
+    # commands do not wait for a new one
+    entry.async_create_background_task(
+        hass,
+        service_configuration.cloud.keep_warm(lambda: service_configuration.ninja_service_url),
+        f"{DOMAIN} keep cloud connection warm",
+    )
+
+    # share the device state with other systems over MQTT, if enabled
+    if entry.options.get(CONF_MQTT_BRIDGE):
+        # only imported when enabled, the MQTT client library is installed with the MQTT integration
+        from .mqtt_bridge import ActronMqttBridge  # pylint: disable=import-outside-toplevel
+
+        bridge = ActronMqttBridge(
+            hass, entry, entry.options.get(CONF_MQTT_TOPIC_PREFIX, DEFAULT_MQTT_TOPIC_PREFIX)
+        )
+        if await bridge.async_start():
+            entry.async_on_unload(bridge.async_stop)
+
+    # reload the entry when its options change
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ActronConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def _async_initialize_device(coordinator: ActronCoordinator, block_id: str) -> None:
+    """Initialize a device restored from a snapshot, then replace the snapshot with live data."""
+    device = coordinator.device
+    try:
+        # refreshing the service configuration after restarts to make sure it is up to date
+        await device.service_configuration.refresh_configuration()
+        await device.init(block_id)
+    except ActronException as e:
+        # the coordinator keeps polling, the device info is refreshed on the next restart
+        _LOGGER.warning("Failed to initialize %s, showing its last known state: %s", device.device_id, e)
+    await coordinator.async_refresh()
+
+
+def _storage_key(entry: ActronConfigEntry) -> str:
+    """Return the key of the state snapshot of an entry."""
+    return f"{DOMAIN}.{entry.entry_id}"
+
+
+def _journal_storage_key(entry: ActronConfigEntry) -> str:
+    """Return the key of the command journal of an entry."""
+    return f"{DOMAIN}.{entry.entry_id}.commands"
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ActronConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ActronConfigEntry) -> None:
+    """Remove the state snapshot and command journal of a deleted config entry."""
+    await Store[dict](hass, STORAGE_VERSION, _storage_key(entry)).async_remove()
+    await Store[dict](hass, STORAGE_VERSION, _journal_storage_key(entry)).async_remove()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 import logging
 
 from homeassistant.components.climate import (
@@ -15,6 +16,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
 from .const import (
+    INSIDE_TEMPERATURE_DEADBAND,
+    INSIDE_TEMPERATURE_MIN_INTERVAL_SECONDS,
     DEVICE_TARGET_TEMPERATURE_STEP,
     DEVICE_MIN_TEMP,
     DEVICE_MAX_TEMP,
@@ -23,6 +26,7 @@ from .const import (
 
 from .coordinator import ActronConfigEntry, ActronCoordinator
 from .entity import ActronEntity
+from .pyactron.state import ApplianceState
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +51,9 @@ async def async_setup_entry(
 class ActronClimate(ActronEntity, ClimateEntity):
     """Representation of a Actron HVAC."""
 
+    _state_deadband = INSIDE_TEMPERATURE_DEADBAND
+    _state_min_interval = INSIDE_TEMPERATURE_MIN_INTERVAL_SECONDS
+
     def __init__(self, coordinator: ActronCoordinator) -> None:
         """Initialize the climate device."""
         super().__init__(coordinator)
@@ -68,29 +75,38 @@ class ActronClimate(ActronEntity, ClimateEntity):
     async def async_set_hvac_mode(self, hvac_mode):
         """Set new target hvac mode."""
         await self.device.async_set_hvac_mode(hvac_mode)
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
 
     async def async_turn_on(self):
         """Turn the entity on."""
         await self.device.async_turn_on()
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self):
         """Turn the entity off."""
         await self.device.async_turn_off()
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
 
     async def async_set_fan_mode(self, fan_mode):
         """Set new target fan mode."""
         await self.device.async_set_fan_mode(fan_mode)
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
 
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         # Extract temperature from kwargs and convert to float
         target_temperature = float(kwargs.get(ATTR_TEMPERATURE))
         await self.device.async_set_temperature(target_temperature)
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
+
+    def _rate_limited_value(self) -> tuple[float | None, ApplianceState]:
+        """Return the inside temperature, and the rest of the device state."""
+        return self.device.current_temperature, replace(self.device.state, current_temperature=0.0)
 
     @property
     def current_temperature(self) -> float:
@@ -105,12 +121,12 @@ class ActronClimate(ActronEntity, ClimateEntity):
     @property
     def hvac_action(self) -> HVACAction:
         """Return device's on status."""
-        return self.device.compressor_activity
+        return HVACAction(self.device.compressor_activity)
 
     @property
     def hvac_mode(self) -> HVACMode:
         """Return the current HVAC mode."""
-        return self.device.mode
+        return HVACMode(self.device.mode)
 
     @property
     def target_temperature(self) -> float:
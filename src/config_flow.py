@@ -2,40 +2,80 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+from dataclasses import asdict
+import ipaddress
 import logging
 from typing import Any
 
-import aiohttp
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.components import network
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .pyactron.exceptions import ActronException
-
 from .pyactron.actron_user import ActronUser
-
-from .const import CONF_SERVICE_CONFIGURATION, CONF_USER, DOMAIN
-from .pyactron.service_configuration import ServiceConfiguration
+from .pyactron.appliance import Appliance
+from .pyactron.discovery import ControllerScanner, DiscoveredController, block_id_matches
+from .pyactron.exceptions import ActronAuthenticationError, ActronConnectionError
+
+from .const import (
+    CONF_BLOCK_ID,
+    CONF_CONTROLLER,
+    CONF_MQTT_BRIDGE,
+    CONF_MQTT_TOPIC_PREFIX,
+    CONF_SERVICE_CONFIGURATION,
+    CONF_SERVICE_CONFIGURATION_URL,
+    CONF_USER,
+    DEFAULT_MQTT_TOPIC_PREFIX,
+    DOMAIN,
+)
+from .pyactron.service_configuration import SERVICE_CONFIGURATION_URL, ServiceConfiguration
 
 _LOGGER = logging.getLogger(__name__)
 
+# larger networks are only scanned in the /24 around the address of Home Assistant
+DISCOVERY_MIN_NETWORK_PREFIX = 24
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
-        vol.Required(CONF_HOST): str,
+        vol.Optional(CONF_HOST): str,
         vol.Required(CONF_USERNAME): str,
         vol.Required(CONF_PASSWORD): str,
     }
 )
+# lets advanced users sign in against a stand-in for the cloud, such as pyactron.simulator
+STEP_USER_ADVANCED_DATA_SCHEMA = STEP_USER_DATA_SCHEMA.extend(
+    {
+        vol.Optional(CONF_SERVICE_CONFIGURATION_URL, default=SERVICE_CONFIGURATION_URL): str,
+    }
+)
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_MQTT_BRIDGE, default=False): bool,
+        vol.Optional(CONF_MQTT_TOPIC_PREFIX, default=DEFAULT_MQTT_TOPIC_PREFIX): str,
+    }
+)
 
 class FlowHandler(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for actron_connect."""
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        # kept for the flow, so results are not lost when the form is submitted again
+        self._scanner: ControllerScanner | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -43,29 +83,55 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         if user_input is not None:
             try:
-                # retrieve the service configuration
                 session = async_get_clientsession(self.hass)
-                service_configuration = ServiceConfiguration(session)
-                await service_configuration.refresh_configuration()
-
-                # log in
-                user = await self._login(user_input[CONF_USERNAME], user_input[CONF_PASSWORD], service_configuration, session)
+                username = user_input[CONF_USERNAME]
+                password = user_input[CONF_PASSWORD]
+                service_configuration_url = user_input.get(CONF_SERVICE_CONFIGURATION_URL, SERVICE_CONFIGURATION_URL)
+
+                if host := user_input.get(CONF_HOST):
+                    # check the controller while signing in, rather than one after the other
+                    (service_configuration, user, block_id), controller = await asyncio.gather(
+                        self._async_sign_in(username, password, host, session, service_configuration_url),
+                        self._get_scanner(session).probe(host),
+                    )
+                    if controller is None:
+                        raise ControllerNotFound
+                    if not block_id_matches(controller.device_id, block_id):
+                        raise WrongController
+                else:
+                    # look for the controller on the local network
+                    service_configuration, user = await self._async_login(
+                        username, password, session, service_configuration_url
+                    )
+                    controller = await self._async_discover_controller(user.aircon_block_id, session)
+                    if controller is None:
+                        raise NoDevicesFound
+                    block_id = await Appliance(controller.host, service_configuration, user, session).get_block_id()
 
-                # store the service configuration and user data in the entry data
+                # store the service configuration and user data in the entry data, along with
+                # the device details so setup does not fetch them again
                 entry_data = {
-                    CONF_HOST: user_input[CONF_HOST],
-                    CONF_USERNAME: user_input[CONF_USERNAME],
-                    CONF_PASSWORD: user_input[CONF_PASSWORD],
+                    CONF_HOST: controller.host,
+                    CONF_USERNAME: username,
+                    CONF_PASSWORD: password,
                     # Store service configuration data using dataclass serialization
                     CONF_SERVICE_CONFIGURATION: service_configuration.to_dict(),
                     # Store user data using dataclass serialization
                     CONF_USER: user.to_dict(),
+                    CONF_BLOCK_ID: block_id,
+                    CONF_CONTROLLER: asdict(controller),
                 }
-                
-            except CannotConnect:
+
+            except (CannotConnect, ActronConnectionError):
                 errors["base"] = "cannot_connect"
-            except InvalidAuth:
+            except (InvalidAuth, ActronAuthenticationError):
                 errors["base"] = "invalid_auth"
+            except NoDevicesFound:
+                errors["base"] = "no_devices_found"
+            except ControllerNotFound:
+                errors[CONF_HOST] = "controller_not_found"
+            except WrongController:
+                errors[CONF_HOST] = "wrong_controller"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -73,50 +139,79 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(title=entry_data[CONF_HOST], data=entry_data)
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="user",
+            data_schema=STEP_USER_ADVANCED_DATA_SCHEMA if self.show_advanced_options else STEP_USER_DATA_SCHEMA,
+            errors=errors,
         )
 
+    async def _async_login(
+        self, username: str, password: str, session, service_configuration_url: str = SERVICE_CONFIGURATION_URL
+    ) -> tuple[ServiceConfiguration, ActronUser]:
+        """Retrieve the service configuration and log in."""
+        service_configuration = ServiceConfiguration(session, service_configuration_url)
+        await service_configuration.refresh_configuration()
+        user = await self._login(username, password, service_configuration, session)
+        return service_configuration, user
+
+    async def _async_sign_in(
+        self,
+        username: str,
+        password: str,
+        host: str,
+        session,
+        service_configuration_url: str = SERVICE_CONFIGURATION_URL,
+    ) -> tuple[ServiceConfiguration, ActronUser, str]:
+        """Log in and look up the block id of the device."""
+        service_configuration, user = await self._async_login(username, password, session, service_configuration_url)
+        block_id = await Appliance(host, service_configuration, user, session).get_block_id()
+        return service_configuration, user, block_id
+
+    def _get_scanner(self, session) -> ControllerScanner:
+        """Return the scanner of the flow."""
+        if self._scanner is None:
+            self._scanner = ControllerScanner(session)
+        return self._scanner
+
+    async def _async_discover_controller(self, block_id: str, session) -> DiscoveredController | None:
+        """Scan the local networks for the controller of a cloud block id."""
+        scanner = self._get_scanner(session)
+        if controller := await scanner.locate(block_id):
+            return controller
+
+        for adapter in await network.async_get_adapters(self.hass):
+            if not adapter["enabled"]:
+                continue
+            for ipv4 in adapter["ipv4"]:
+                if ipaddress.ip_address(ipv4["address"]).is_loopback:
+                    continue
+                prefix = max(ipv4["network_prefix"], DISCOVERY_MIN_NETWORK_PREFIX)
+                _LOGGER.debug("Scanning %s/%s for Actron controllers", ipv4["address"], prefix)
+                await scanner.scan_network(f"{ipv4['address']}/{prefix}")
+                if controller := scanner.find(block_id):
+                    return controller
+
+        return None
+
     async def _login(self, username, password, service_configuration, session) -> ActronUser:
         """Login to the Actron cloud service."""
+        return await ActronUser.login(username, password, service_configuration, session)
+
+
+class OptionsFlowHandler(OptionsFlow):
+    """Handle the options of an actron_connect entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(OPTIONS_SCHEMA, self.config_entry.options),
+        )
 
-        _LOGGER.debug("Loading service configuration from: %s/signin", service_configuration.service_base_url)
-
-        try:
-            async with session.post(
-                f'{service_configuration.service_base_url}/signin',
-                auth=aiohttp.BasicAuth(username, password),
-            ) as response:
-                if response.status != 200:
-                    _LOGGER.debug(
-                        "Unexpected HTTP status code %s for %s",
-                        response.status,
-                        response.url,
-                    )
-                response.raise_for_status()
-
-                data = json.loads(await response.text())
-
-                return ActronUser(
-                    email=data['value']['email'],
-                    fullname=data['value']['fullname'],
-                    address=data['value']['address1'],
-                    suburb=data['value']['suburb'],
-                    postcode=data['value']['postcode'],
-                    state=data['value']['state'],
-                    country=data['value']['country'],
-                    user_access_token=data['value']['userAccessToken'],
-                    last_updated=data['value']['lastUpdated'],
-                    created_at=data['value']['createdAt'],
-                    timezone=data['value']['timezone'],
-                    version=data['value']['version'],
-                    aircon_block_id=data['value']['airconBlockId'],
-                    aircon_type=data['value']['airconType'],
-                    aircon_zone_number=data['value']['airconZoneNumber'],
-                    zones=data['value']['zones'],
-                )
-        except Exception as e:
-            _LOGGER.error("Unexpected error while fetching service configuration: %s", e)
-            raise ActronException(f"Unexpected error: {e}") from e
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -124,3 +219,15 @@ class CannotConnect(HomeAssistantError):
 
 class InvalidAuth(HomeAssistantError):
     """Error to indicate there is invalid auth."""
+
+
+class NoDevicesFound(HomeAssistantError):
+    """Error to indicate the controller was not found on the local network."""
+
+
+class ControllerNotFound(HomeAssistantError):
+    """Error to indicate there is no controller at the host entered."""
+
+
+class WrongController(HomeAssistantError):
+    """Error to indicate the controller at the host entered is not the one of the account."""
@@ -6,11 +6,27 @@ from homeassistant.const import UnitOfTemperature
 DOMAIN = "actron_connect"
 ATTR_INSIDE_TEMPERATURE = "inside_temperature"
 CONF_SERVICE_CONFIGURATION = "service_configuration"
+CONF_SERVICE_CONFIGURATION_URL = "service_configuration_url"
 CONF_USER = "user"
+CONF_BLOCK_ID = "block_id"
+CONF_CONTROLLER = "controller"
+CONF_MQTT_BRIDGE = "mqtt_bridge"
+CONF_MQTT_TOPIC_PREFIX = "mqtt_topic_prefix"
+STORAGE_VERSION = 1
 
 # You can change these values to best fit your device and needs
 DEVICE_TARGET_TEMPERATURE_STEP = 0.5
 DEVICE_MIN_TEMP = 16
 DEVICE_MAX_TEMP = 30
 DEVICE_TEMP_UNIT = UnitOfTemperature.CELSIUS
-DEVICE_UPDATE_SKIP_SECONDS = 20
+DEFAULT_MQTT_TOPIC_PREFIX = "actron_connect"
+DEVICE_REFRESH_COOLDOWN_SECONDS = 1.5
+DEVICE_SNAPSHOT_SAVE_DELAY_SECONDS = 60
+# coordinator updates moving the inside temperature by less than the deadband (in
+# degrees) or sooner than the minimum interval are held back, and written after the
+# maximum hold at the latest, to limit the states stored by the recorder
+INSIDE_TEMPERATURE_DEADBAND = 0.2
+INSIDE_TEMPERATURE_MIN_INTERVAL_SECONDS = 60
+STATE_MAX_HOLD_SECONDS = 300
+# runtime statistics do not count the time between two polls further apart than this
+RUNTIME_MAX_SAMPLE_GAP_SECONDS = 60
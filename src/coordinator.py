@@ -1,13 +1,20 @@
 """Coordinator for Daikin integration."""
 
+import asyncio
 from datetime import timedelta
 import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .const import DEVICE_REFRESH_COOLDOWN_SECONDS, DEVICE_SNAPSHOT_SAVE_DELAY_SECONDS, DOMAIN
 from .pyactron.appliance import Appliance
+from .pyactron.const import RequestPriority
+from .pyactron.exceptions import ActronException
+from .runtime import ActronRuntimeStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,7 +26,9 @@ class ActronCoordinator(DataUpdateCoordinator[None]):
         self,
         hass: HomeAssistant,
         entry: ActronConfigEntry, 
-        device: Appliance
+        device: Appliance,
+        store: Store[dict],
+        journal_store: Store[dict],
     ) -> None:
         """Initialize global Actron data updater."""
         super().__init__(
@@ -28,10 +37,62 @@ class ActronCoordinator(DataUpdateCoordinator[None]):
             config_entry=entry,
             name=device.device_id,
             update_interval=timedelta(seconds=10),
+            # commands write their optimistic state straight away and only request a
+            # refresh, so a burst of commands (scenes, automations) coalesces into one
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=DEVICE_REFRESH_COOLDOWN_SECONDS,
+                immediate=False,
+            ),
         )
         self.device = device
+        self.store = store
+        self.runtime = ActronRuntimeStatistics(hass, entry, device)
+        self._refresh_requested = False
+        self._snapshot_save_pending = False
+        self._replay_task: asyncio.Task | None = None
+        if device.command_journal is not None:
+            # commands kept while the Ninja service is unreachable must survive a restart, they
+            # are saved straight away, in their own store so snapshot saves do not hold them back
+            device.command_journal.on_change = lambda: journal_store.async_delay_save(
+                device.command_journal.to_dict, 0
+            )
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh, confirming a command, ahead of routine polls."""
+        self._refresh_requested = True
+        await super().async_request_refresh()
 
     async def _async_update_data(self) -> None:
-        await self.device.update_status()
+        priority = RequestPriority.CONFIRMATION if self._refresh_requested else RequestPriority.POLL
+        self._refresh_requested = False
+        if self.device.command_journal and (self._replay_task is None or self._replay_task.done()):
+            # the replay waits on the cloud, possibly until it times out, the local status is
+            # read in the meantime
+            self._replay_task = self.config_entry.async_create_background_task(
+                self.hass, self._async_replay_commands(), f"{DOMAIN} replay {self.device.device_id}"
+            )
+        await self.device.update_status(priority)
+        self.runtime.async_add_sample()
+
+        # persist the latest state so entities can be restored straight away after a restart,
+        # a pending save is left alone since scheduling it again would push it back
+        if not self._snapshot_save_pending:
+            self._snapshot_save_pending = True
+            self.store.async_delay_save(self._snapshot, DEVICE_SNAPSHOT_SAVE_DELAY_SECONDS)
+
+    async def _async_replay_commands(self) -> None:
+        """Send the commands kept while the Ninja service was unreachable."""
+        try:
+            await self.device.replay_commands()
+        except ActronException:
+            # already logged, the rejected commands were dropped
+            pass
+
+    def _snapshot(self) -> dict:
+        """Return the state to save, called when the delayed save runs."""
+        self._snapshot_save_pending = False
+        return self.device.to_dict()
 
 
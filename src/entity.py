@@ -1,20 +1,44 @@
 """Base entity for Actron."""
 
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .const import STATE_MAX_HOLD_SECONDS
 from .coordinator import ActronCoordinator
 
 
 class ActronEntity(CoordinatorEntity[ActronCoordinator]):
-    """Base entity for Actron."""
+    """Base entity for Actron.
+
+    Entities returning a value from _rate_limited_value only write their state on a
+    coordinator update if that value moved by at least _state_deadband, and no sooner
+    than _state_min_interval seconds after the last write. Held back values are
+    written after _state_max_hold seconds at the latest, and any change to the rest
+    of the state is written straight away.
+    """
 
     _attr_has_entity_name = True
+    _state_deadband: float = 0.0
+    _state_min_interval: float = 0.0
+    _state_max_hold: float = STATE_MAX_HOLD_SECONDS
 
     def __init__(self, coordinator: ActronCoordinator) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
         self.device = coordinator.device
+        # value, rest of the state and time the value last changed in a write
+        self._written: tuple[float | None, Any, float] | None = None
+        self._held_since: float | None = None
+        self._flush_at: float | None = None
+        self._cancel_flush: Callable[[], None] | None = None
 
         self._attr_device_info = DeviceInfo(
             connections={
@@ -25,3 +49,73 @@ class ActronEntity(CoordinatorEntity[ActronCoordinator]):
             name=self.device.device_id,
             sw_version= self.device.firmware_version,
         )
+
+    def _rate_limited_value(self) -> tuple[float | None, Any]:
+        """Return the value to rate limit, and the rest of the state to compare."""
+        return None, None
+
+    @property
+    def _is_rate_limited(self) -> bool:
+        return bool(self._state_deadband or self._state_min_interval)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, and remember what was written for the rate limits."""
+        if self._is_rate_limited:
+            value, rest = self._rate_limited_value()
+            written_at = time.monotonic()
+            if self._written is not None and value == self._written[0]:
+                # writes repeating the value, on every coordinator update, do not delay its next change
+                written_at = self._written[2]
+            self._written = (value, (rest, self.available), written_at)
+            self._held_since = None
+            self._cancel_pending_flush()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state, unless only the rate limited value changed a little or too soon."""
+        if not self._is_rate_limited or self._written is None:
+            super()._handle_coordinator_update()
+            return
+
+        value, rest = self._rate_limited_value()
+        written_value, written_rest, written_at = self._written
+        if (rest, self.available) != written_rest or value is None or written_value is None or value == written_value:
+            super()._handle_coordinator_update()
+            return
+
+        now = time.monotonic()
+        outside_deadband = abs(value - written_value) >= self._state_deadband
+        if outside_deadband and now - written_at >= self._state_min_interval:
+            super()._handle_coordinator_update()
+            return
+
+        # hold the value back, it is written when the hold expires at the latest
+        if self._held_since is None:
+            self._held_since = now
+        flush_at = self._held_since + self._state_max_hold
+        if outside_deadband:
+            flush_at = min(flush_at, written_at + self._state_min_interval)
+        if self._flush_at is None or flush_at < self._flush_at:
+            self._cancel_pending_flush()
+            self._flush_at = flush_at
+            self._cancel_flush = async_call_later(self.hass, max(0.0, flush_at - now), self._async_flush)
+
+    @callback
+    def _async_flush(self, _now) -> None:
+        """Write the held back value."""
+        self._cancel_flush = None
+        self._flush_at = None
+        self.async_write_ha_state()
+
+    def _cancel_pending_flush(self) -> None:
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+        self._flush_at = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the pending write of a held back value."""
+        self._cancel_pending_flush()
+        await super().async_will_remove_from_hass()
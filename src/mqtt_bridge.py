@@ -0,0 +1,133 @@
+"""MQTT bridge for Actron devices."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+import logging
+
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import ActronConfigEntry, ActronCoordinator
+from .pyactron.exceptions import ActronException
+from .pyactron.state import StateDelta
+
+_LOGGER = logging.getLogger(__name__)
+
+_TRUE_PAYLOADS = {"1", "on", "true"}
+_FALSE_PAYLOADS = {"0", "off", "false"}
+
+
+def _format_value(value) -> str:
+    """Format a state value as an MQTT payload."""
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, tuple):
+        return json.dumps(list(value))
+    return json.dumps(value)
+
+
+def _parse_bool(payload: str) -> bool:
+    value = payload.strip().lower()
+    if value in _TRUE_PAYLOADS:
+        return True
+    if value in _FALSE_PAYLOADS:
+        return False
+    raise ValueError(f"Invalid boolean: {payload}")
+
+
+class ActronMqttBridge:
+    """Publish the state of a device to MQTT and accept commands from it.
+
+    Each field of the device state is published, retained, to its own topic
+    ``<prefix>/<device id>/<field>``, and only when it changes. Commands are accepted
+    on ``<prefix>/<device id>/<field>/set`` for is_on, mode, fan_speed and
+    target_temperature, and on ``<prefix>/<device id>/zone/<zone id>/set``.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ActronConfigEntry, topic_prefix: str) -> None:
+        """Initialize the bridge."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinator: ActronCoordinator = entry.runtime_data
+        self.device = self.coordinator.device
+        self.base_topic = f"{topic_prefix}/{self.device.device_id}"
+        self._unsubscribe: list[Callable[[], None]] = []
+
+    async def async_start(self) -> bool:
+        """Start the bridge, returning False if MQTT is not available."""
+        if not await mqtt.async_wait_for_mqtt_client(self.hass):
+            _LOGGER.error("MQTT is not available, the bridge for %s is not started", self.device.device_id)
+            return False
+
+        self._unsubscribe.append(
+            await mqtt.async_subscribe(self.hass, f"{self.base_topic}/+/set", self._async_message_received)
+        )
+        self._unsubscribe.append(
+            await mqtt.async_subscribe(self.hass, f"{self.base_topic}/zone/+/set", self._async_message_received)
+        )
+        self.entry.async_create_background_task(
+            self.hass, self._async_publish_changes(), f"{DOMAIN} mqtt bridge {self.device.device_id}"
+        )
+        return True
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop accepting commands, publishing stops with the entry's background tasks."""
+        while self._unsubscribe:
+            self._unsubscribe.pop()()
+
+    async def _async_publish_changes(self) -> None:
+        """Publish each state change as it happens."""
+        delta: StateDelta
+        async for delta in self.device.watch():
+            for name, value in delta.changes.items():
+                await mqtt.async_publish(
+                    self.hass, f"{self.base_topic}/{name}", _format_value(value), qos=0, retain=True
+                )
+
+    @callback
+    def _async_message_received(self, msg: mqtt.ReceiveMessage) -> None:
+        """Handle a command received on a set topic."""
+        self.entry.async_create_task(
+            self.hass, self._async_handle_command(msg.topic, str(msg.payload)), f"{DOMAIN} mqtt command"
+        )
+
+    async def _async_handle_command(self, topic: str, payload: str) -> None:
+        """Send a command through the same path as the entities."""
+        path = topic[len(self.base_topic) + 1 : -len("/set")].split("/")
+        try:
+            match path:
+                case ["is_on"]:
+                    if _parse_bool(payload):
+                        await self.device.async_turn_on()
+                    else:
+                        await self.device.async_turn_off()
+                case ["mode"]:
+                    await self.device.async_set_hvac_mode(payload.strip())
+                case ["fan_speed"]:
+                    await self.device.async_set_fan_mode(payload.strip())
+                case ["target_temperature"]:
+                    await self.device.async_set_temperature(float(payload))
+                case ["zone", zone_id]:
+                    if not 0 <= int(zone_id) < len(self.device.enabled_zones):
+                        raise IndexError(f"Unknown zone {zone_id}")
+                    if _parse_bool(payload):
+                        await self.device.async_zone_turn_on(int(zone_id))
+                    else:
+                        await self.device.async_zone_turn_off(int(zone_id))
+                case _:
+                    _LOGGER.warning("Ignoring command on unsupported topic %s", topic)
+                    return
+        except (ValueError, KeyError, IndexError) as e:
+            _LOGGER.warning("Ignoring invalid command %s on %s: %s", payload, topic, e)
+            return
+        except ActronException as e:
+            _LOGGER.error("Failed to send command %s on %s: %s", payload, topic, e)
+            return
+
+        # entities pick up the optimistic state, and the coordinator confirms it
+        self.coordinator.async_update_listeners()
+        await self.coordinator.async_request_refresh()
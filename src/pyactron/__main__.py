@@ -0,0 +1,233 @@
+"""Command line interface for pyactron.
+
+Sign in once with ``login``, the session data is then cached on disk and reused by
+the other commands::
+
+    python -m pyactron login --host 192.168.1.50 --username me@example.com
+    python -m pyactron status
+    python -m pyactron set --mode cool --temperature 22 --zone 1=off
+    python -m pyactron watch --interval 1
+    python -m pyactron bench --count 50
+    python -m pyactron export --port 9852
+"""
+
+import argparse
+import asyncio
+import getpass
+import json
+import logging
+import os
+from pathlib import Path
+import statistics
+import sys
+import time
+
+from aiohttp import ClientSession
+
+from .actron_user import ActronUser
+from .appliance import FAN_SPEED_STRING_TO_ACTRON, HVACMODE_TO_ACTRON, Appliance
+from .cloud_client import create_session
+from .const import HVACMode, RequestPriority
+from .exceptions import ActronException
+from .metrics import MetricsExporter
+from .service_configuration import SERVICE_CONFIGURATION_URL, ServiceConfiguration
+
+CACHE_FILE = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "pyactron" / "session.json"
+
+
+def _load_cache(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        sys.exit(f"No cached session in {path}, run the login command first")
+
+
+def _save_cache(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # the cache holds the user access token, keep it private
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def _create_appliance(cache: dict, session: ClientSession) -> Appliance:
+    service_configuration = ServiceConfiguration.from_dict(cache["service_configuration"], session)
+    user = ActronUser.from_dict(cache["user"])
+    return Appliance(cache["host"], service_configuration, user, session)
+
+
+def _summary(name: str, samples: list[float]) -> str:
+    if not samples:
+        return f"{name}: no successful samples"
+    ordered = sorted(ms * 1000 for ms in samples)
+
+    def percentile(percent: int) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    return (
+        f"{name}: n={len(ordered)} min={ordered[0]:.1f}ms p50={statistics.median(ordered):.1f}ms "
+        f"p90={percentile(90):.1f}ms p99={percentile(99):.1f}ms max={ordered[-1]:.1f}ms"
+    )
+
+
+async def _login(args, session: ClientSession) -> None:
+    password = args.password or os.environ.get("ACTRON_PASSWORD") or getpass.getpass()
+    service_configuration = ServiceConfiguration(session, args.service_configuration_url)
+    await service_configuration.refresh_configuration()
+    user = await ActronUser.login(args.username, password, service_configuration, session)
+
+    device = Appliance(args.host, service_configuration, user, session)
+    await device.init()
+
+    _save_cache(
+        args.cache,
+        {
+            "host": args.host,
+            "service_configuration": service_configuration.to_dict(),
+            "user": user.to_dict(),
+            "block_id": device.block_id,
+        },
+    )
+    print(f"Signed in as {user.email}, {device.device_id} ({user.aircon_model}) cached in {args.cache}")
+
+
+async def _status(args, session: ClientSession) -> None:
+    device = _create_appliance(_load_cache(args.cache), session)
+    await device.update_status(RequestPriority.INTERACTIVE)
+    state = device.state.to_dict()
+    if args.json:
+        print(json.dumps(state))
+    else:
+        for key, value in state.items():
+            print(f"{key:>20}: {value}")
+
+
+async def _set(args, session: ClientSession) -> None:
+    cache = _load_cache(args.cache)
+    device = _create_appliance(cache, session)
+    await device.init(cache["block_id"])
+
+    if args.power == "off":
+        await device.async_turn_off()
+    elif args.power == "on":
+        await device.async_turn_on()
+    if args.mode:
+        await device.async_set_hvac_mode(args.mode)
+    if args.fan:
+        await device.async_set_fan_mode(args.fan)
+    if args.temperature is not None:
+        await device.async_set_temperature(args.temperature)
+    for zone in args.zone:
+        zone_id, _, value = zone.partition("=")
+        if value == "on":
+            await device.async_zone_turn_on(int(zone_id))
+        elif value == "off":
+            await device.async_zone_turn_off(int(zone_id))
+        else:
+            sys.exit(f"Invalid zone setting: {zone}, expected <zone>=on or <zone>=off")
+
+
+async def _watch(args, session: ClientSession) -> None:
+    device = _create_appliance(_load_cache(args.cache), session)
+    async for delta in device.watch(poll_interval=args.interval):
+        changes = {key: list(value) if isinstance(value, tuple) else value for key, value in delta.changes.items()}
+        print(f"{delta.timestamp.isoformat(timespec='milliseconds')} {json.dumps(changes)}", flush=True)
+
+
+async def _bench(args, session: ClientSession) -> None:
+    device = _create_appliance(_load_cache(args.cache), session)
+
+    async def measure(request) -> list[float]:
+        samples = []
+        for _ in range(args.count):
+            started = time.perf_counter()
+            try:
+                await request()
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"request failed: {e}", file=sys.stderr)
+                continue
+            samples.append(time.perf_counter() - started)
+        return samples
+
+    print(_summary("lan   6.json ", await measure(lambda: device._get_resource("6.json"))))  # pylint: disable=protected-access
+    if not args.lan_only:
+        print(_summary("cloud devices", await measure(device._get_block_id_from_remote_service)))  # pylint: disable=protected-access
+
+
+async def _export(args, session: ClientSession) -> None:
+    cache = _load_cache(args.cache)
+    device = _create_appliance(cache, session)
+    await device.init(cache["block_id"])
+
+    exporter = MetricsExporter()
+    exporter.add_appliance(device, poll_interval=args.interval)
+    await exporter.start(args.listen, args.port)
+    print(f"Serving metrics on http://{args.listen}:{args.port}/metrics", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await exporter.stop()
+
+
+def main() -> None:
+    """Run the command line interface."""
+    parser = argparse.ArgumentParser(prog="pyactron", description="Control an Actron Connect device.")
+    parser.add_argument("--cache", type=Path, default=CACHE_FILE, help=f"session cache file (default: {CACHE_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    login = commands.add_parser("login", help="sign in and cache the session data")
+    login.add_argument("--host", required=True, help="host name or IP address of the local controller")
+    login.add_argument("--username", required=True)
+    login.add_argument("--password", help="defaults to $ACTRON_PASSWORD, or prompts")
+    login.add_argument(
+        "--service-configuration-url",
+        default=SERVICE_CONFIGURATION_URL,
+        help="cloud app-config endpoint, e.g. the one of pyactron.simulator",
+    )
+    login.set_defaults(handler=_login)
+
+    status = commands.add_parser("status", help="print the current state")
+    status.add_argument("--json", action="store_true", help="print the state as JSON")
+    status.set_defaults(handler=_status)
+
+    set_ = commands.add_parser("set", help="send commands")
+    set_.add_argument("--power", choices=["on", "off"])
+    set_.add_argument("--mode", choices=[str(mode) for mode in HVACMODE_TO_ACTRON] + [str(HVACMode.OFF)])
+    set_.add_argument("--fan", choices=list(FAN_SPEED_STRING_TO_ACTRON))
+    set_.add_argument("--temperature", type=float)
+    set_.add_argument("--zone", action="append", default=[], metavar="ZONE=on|off")
+    set_.set_defaults(handler=_set)
+
+    watch = commands.add_parser("watch", help="print state changes as they happen")
+    watch.add_argument("--interval", type=float, default=1.0, help="seconds between polls")
+    watch.set_defaults(handler=_watch)
+
+    bench = commands.add_parser("bench", help="measure LAN and cloud latency")
+    bench.add_argument("--count", type=int, default=20, help="requests per endpoint")
+    bench.add_argument("--lan-only", action="store_true", help="skip the cloud measurements")
+    bench.set_defaults(handler=_bench)
+
+    export = commands.add_parser("export", help="serve OpenMetrics telemetry for Prometheus")
+    export.add_argument("--listen", default="0.0.0.0", help="address to listen on")
+    export.add_argument("--port", type=int, default=9852)
+    export.add_argument("--interval", type=float, default=10.0, help="seconds between polls")
+    export.set_defaults(handler=_export)
+
+    parser.add_argument("--debug", action="store_true", help="log requests and responses")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING, format="%(levelname)s %(message)s")
+
+    async def run() -> None:
+        async with create_session() as session:
+            await args.handler(args, session)
+
+    try:
+        asyncio.run(run())
+    except ActronException as e:
+        sys.exit(str(e))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 """Actron user class."""
 
 from datetime import datetime
+import json
 import logging
 from dataclasses import dataclass, asdict
 from typing import Optional
 
+import aiohttp
+
+from .client_metrics import Operation
+from .exceptions import ActronException, ActronResponseError
+from .service_configuration import ServiceConfiguration
+
 _LOGGER = logging.getLogger(__name__)
 DEVICE_TYPE_TO_MODEL_NAME = {
     0: "Standard Classic",
@@ -63,4 +70,51 @@ class ActronUser:
             data["last_updated"] = datetime.fromisoformat(data["last_updated"])
         if data.get("created_at"):
             data["created_at"] = datetime.fromisoformat(data["created_at"])
-        return cls(**data)
\ No newline at end of file
+        return cls(**data)
+
+    @classmethod
+    async def login(
+        cls,
+        username: str,
+        password: str,
+        service_configuration: ServiceConfiguration,
+        session: aiohttp.ClientSession,
+    ) -> "ActronUser":
+        """Login to the Actron cloud service."""
+
+        _LOGGER.debug("Loading service configuration from: %s/signin", service_configuration.service_base_url)
+
+        try:
+            response = await service_configuration.cloud.post(
+                f'{service_configuration.service_base_url}/signin',
+                Operation.LOGIN,
+                auth=aiohttp.BasicAuth(username, password),
+            )
+        except ActronException as e:
+            _LOGGER.error("Error while signing in: %s", e)
+            raise
+
+        try:
+            data = json.loads(response)
+
+            return cls(
+                email=data['value']['email'],
+                fullname=data['value']['fullname'],
+                address=data['value']['address1'],
+                suburb=data['value']['suburb'],
+                postcode=data['value']['postcode'],
+                state=data['value']['state'],
+                country=data['value']['country'],
+                user_access_token=data['value']['userAccessToken'],
+                last_updated=data['value']['lastUpdated'],
+                created_at=data['value']['createdAt'],
+                timezone=data['value']['timezone'],
+                version=data['value']['version'],
+                aircon_block_id=data['value']['airconBlockId'],
+                aircon_type=data['value']['airconType'],
+                aircon_zone_number=data['value']['airconZoneNumber'],
+                zones=data['value']['zones'],
+            )
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            _LOGGER.error("Invalid response from the signin endpoint: %s", e)
+            raise ActronResponseError(f"Invalid signin response: {e}") from e
@@ -1,6 +1,8 @@
 """Pyactron base appliance, represent an Actron device."""
 
 import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import json
 import logging
@@ -13,14 +15,18 @@ from aiohttp.client_exceptions import (
     ServerDisconnectedError,
 )
 from aiohttp.web_exceptions import HTTPForbidden
-from homeassistant.components.climate.const import HVACAction, HVACMode
 
 import re
 
-from ..const import DEVICE_UPDATE_SKIP_SECONDS
-from .exceptions import ActronException
+from .const import DEVICE_UPDATE_SKIP_SECONDS, HVACAction, HVACMode, RequestPriority
+from .exceptions import ActronConnectionError, ActronException, ActronRequestDropped, ActronResponseError
 from .actron_user import ActronUser
+from .client_metrics import CLIENT_METRICS, Operation
+from .command_journal import CommandJournal
+from .discovery import DiscoveredController
+from .scheduler import RequestScheduler
 from .service_configuration import ServiceConfiguration
+from .state import ApplianceState, StateDelta
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -62,6 +68,51 @@ ACTRON_TO_HVACACTION = {
     2: HVACAction.IDLE,
 }
 
+def decode_json(response: str):
+    """Decode a JSON response from the device."""
+    return json.loads(response)
+
+
+def zones_to_mask(zones: list[int]) -> int:
+    """Convert a list of zone states, as sent by the device, to a bitmask."""
+    mask = 0
+    for zone_id, enabled in enumerate(zones):
+        if enabled:
+            mask |= 1 << zone_id
+    return mask
+
+
+def mask_to_zones(mask: int, zone_count: int) -> list[int]:
+    """Convert a bitmask to a list of zone states, as expected by the device."""
+    return [mask >> zone_id & 1 for zone_id in range(zone_count)]
+
+
+@dataclass
+class ZoneEdit:
+    """Zone changes to send in a single enabledZones command."""
+
+    done: asyncio.Future
+    changed: int = 0
+    enabled: int = 0
+
+    def set(self, zone_id: int, enabled: bool) -> None:
+        """Add a zone change, replacing any earlier change of the same zone."""
+        bit = 1 << zone_id
+        self.changed |= bit
+        self.enabled = self.enabled | bit if enabled else self.enabled & ~bit
+
+    def apply(self, mask: int) -> int:
+        """Return a zone bitmask with the changes applied."""
+        return (mask & ~self.changed) | self.enabled
+
+
+def _is_unreachable(error: ActronException) -> bool:
+    """Return True if the error means the Ninja service is unreachable, rather than rejecting a command."""
+    if isinstance(error, ActronConnectionError):
+        return True
+    return isinstance(error, ActronResponseError) and error.status is not None and error.status >= 500
+
+
 DEVICE_ID_REGULAR_EXPRESSION = r"\"(ACONNECT[0-9A-F]+_\d_\d_\d)\":{\"vid\":\d,\"did\":\d,\"device_type\":\"airconditioner\",\"default_name\":\"Air Conditioner Settings\""
 
 class Appliance:  # pylint: disable=too-many-public-methods
@@ -84,32 +135,76 @@ class Appliance:  # pylint: disable=too-many-public-methods
     _is_esp_on: bool
     _is_fan_continuous: bool
     _compressor_activity: int
-    _enabled_zones: list[int]
+    _zone_mask: int
+    _zone_count: int
     _skip_update_until: datetime = datetime.min
 
     MAX_CONCURRENT_REQUESTS = 4
-
-    def __init__(self, hostname: str, service_configuration: ServiceConfiguration, user: ActronUser, session: ClientSession) -> None:
-        """Init the pyactron appliance, representing one Actron device."""
+    MAX_WAITING_REQUESTS = 8
+    # seconds a completed status update is considered fresh, 0 only shares requests in flight
+    status_max_age: float = 0.0
+    WATCH_QUEUE_SIZE = 16
+
+    def __init__(
+        self,
+        hostname: str,
+        service_configuration: ServiceConfiguration,
+        user: ActronUser,
+        session: ClientSession,
+        command_journal: Optional[CommandJournal] = None,
+    ) -> None:
+        """Init the pyactron appliance, representing one Actron device.
+
+        With a command journal, commands given while the Ninja service is unreachable are
+        kept in the journal and sent by replay_commands, rather than failing.
+        """
         self.hostname = hostname
         self.base_url = f"http://{self.hostname}"
         self.service_configuration = service_configuration
         self.user = user
         self.session = session
-        self.request_semaphore = asyncio.Semaphore(value=self.MAX_CONCURRENT_REQUESTS)
+        self.command_journal = command_journal
+        self.request_scheduler = RequestScheduler(self.MAX_CONCURRENT_REQUESTS, self.MAX_WAITING_REQUESTS)
         self.headers: dict = {}
-
-    async def init(self):
-        """Initialize the device and fetch initial state."""
-        self._block_id = await self._get_block_id_from_remote_service()
-        await self.update_device_info()
+        self._state: ApplianceState | None = None
+        self._subscribers: set[asyncio.Queue] = set()
+        self._poll_intervals: list[float] = []
+        self._poll_task: asyncio.Task | None = None
+        self._zone_lock = asyncio.Lock()
+        self._replay_lock = asyncio.Lock()
+        self._zone_edit: ZoneEdit | None = None
+        self._zone_tasks: set[asyncio.Task] = set()
+        # values of the commands sent within the skip window
+        self._recent_command: dict = {}
+        self._status_fetch: tuple[RequestPriority, asyncio.Task] | None = None
+        self._status_updated_at = float("-inf")
+        # fetches are numbered so an older one finishing late does not overwrite a newer result
+        self._status_generation = 0
+        self._status_applied_generation = 0
+
+    async def init(self, block_id: Optional[str] = None, controller: Optional[DiscoveredController] = None):
+        """Initialize the device and fetch initial state.
+
+        The block id and the controller details are only fetched if they are not given.
+        """
+        self._block_id = block_id or await self._get_block_id_from_remote_service()
+        if controller is None:
+            await self.update_device_info()
+        else:
+            self._mac = controller.mac
+            self._device_id = controller.device_id
+            self._firmwareVersion = controller.firmware_version
         await self.update_status()
 
+    async def get_block_id(self) -> str:
+        """Return the block id of the device from the Ninja service."""
+        return await self._get_block_id_from_remote_service()
+
     async def update_device_info(self):
         """Update device info."""
         # fetch info form the local device
         try:
-            info_response = await self._get_resource("1.json")
+            info_response = await self._get_resource("1.json", priority=RequestPriority.INFO)
 
             if not info_response:
                 raise ActronException("Invalid response from device")
@@ -119,7 +214,7 @@ class Appliance:  # pylint: disable=too-many-public-methods
 
         # Extract basic info
         try:
-            data = json.loads(info_response)
+            data = decode_json(info_response)
 
             self._mac = data['MacAddress']
             self._device_id = data['BlockID']
@@ -128,41 +223,214 @@ class Appliance:  # pylint: disable=too-many-public-methods
             _LOGGER.error("Error extracting values: %s", e)
             raise
 
-    async def update_status(self):
-        """Update device status."""
+    async def update_status(self, priority: RequestPriority = RequestPriority.POLL):
+        """Update device status.
+
+        Concurrent updates share a single request to the device, unless the request in
+        flight is less urgent. An update within status_max_age seconds of the last
+        completed one is skipped.
+        """
 
         # updating the state of the device can take some time to propagate to the actual device
         # so we delay the update to the next update cycle to avoid the state going back and forth
-        # between actual state and desired state
-        if self._skip_update_until < datetime.now():
+        # between actual state and desired state. Confirmations and interactive reads go
+        # through, the values of recent commands are kept over the ones they read.
+        if priority <= RequestPriority.CONFIRMATION or self._skip_update_until < datetime.now():
+            loop = asyncio.get_running_loop()
+            if loop.time() - self._status_updated_at < self.status_max_age:
+                return
+
+            if self._status_fetch is None or self._status_fetch[0] > priority:
+                self._status_generation += 1
+                task = loop.create_task(self._fetch_status(priority, self._status_generation))
+                # the outcome is retrieved by the callers, unless they were all cancelled
+                task.add_done_callback(lambda task: task.cancelled() or task.exception())
+                self._status_fetch = (priority, task)
+            # a cancelled caller does not cancel the request for the others
+            await asyncio.shield(self._status_fetch[1])
+
+    async def _fetch_status(self, priority: RequestPriority, generation: int) -> None:
+        """Fetch and apply the device status, unless a newer fetch was applied already."""
+        try:
             # fetch info form the local device
             try:
-                data_response = await self._get_resource("6.json")
+                data_response = await self._get_resource("6.json", priority=priority)
 
                 if not data_response:
                     raise ActronException("Invalid response from device")
+            except ActronRequestDropped as e:
+                # the device is saturated, keep the last state until the next update
+                _LOGGER.debug("Skipped a status update of %s: %s", self.hostname, e)
+                return
             except Exception as e:
                 _LOGGER.error("Error communicating with device: %s", e)
                 raise ActronException(f"Failed to communicate with device: {e}") from e
 
+            if generation < self._status_applied_generation:
+                _LOGGER.debug("Discarded a stale status update of %s", self.hostname)
+                return
+
             # Extract basic info
             try:
-                data = json.loads(data_response)
-
-                self._is_on = data['isOn']
-                self._mode = data['mode']
-                self._fan_speed = data['fanSpeed']
-                self._target_temperature = data['setPoint']
-                self._current_temperature = data['roomTemp_oC']
-                self._is_esp_on = data['isInESP_Mode']
-                self._is_fan_continuous = data['fanIsCont']
-                self._compressor_activity = data['compressorActivity']
-                self._enabled_zones = data['enabledZones']
-            except ActronException as e:
+                self.apply_status(decode_json(data_response))
+            except (ValueError, KeyError, TypeError) as e:
                 _LOGGER.error("Error extracting values: %s", e)
-                raise
+                raise ActronResponseError(f"Invalid status from device: {e}") from e
+            self._status_applied_generation = generation
+            self._status_updated_at = asyncio.get_running_loop().time()
+        finally:
+            if self._status_fetch is not None and self._status_fetch[1] is asyncio.current_task():
+                self._status_fetch = None
+
+    def apply_status(self, data: dict) -> None:
+        """Apply a status update, in the format of 6.json, from polling or a push source."""
+        self._is_on = data['isOn']
+        self._mode = data['mode']
+        self._fan_speed = data['fanSpeed']
+        self._target_temperature = data['setPoint']
+        self._current_temperature = data['roomTemp_oC']
+        self._is_esp_on = data['isInESP_Mode']
+        self._is_fan_continuous = data['fanIsCont']
+        self._compressor_activity = data['compressorActivity']
+        self._zone_mask = zones_to_mask(data['enabledZones'])
+        self._zone_count = len(data['enabledZones'])
+        if self._skip_update_until >= datetime.now():
+            # the commands sent recently might not have reached the device yet
+            self._apply_command(self._recent_command)
+        if self.command_journal:
+            # the device does not have the commands waiting in the journal yet
+            self._apply_command(self.command_journal.pending())
+        self._publish_state()
+
+    def _apply_command(self, command: dict) -> None:
+        """Apply the values of a DA command to the state."""
+        for key, value in command.items():
+            match key:
+                case "amOn":
+                    self._is_on = bool(value)
+                case "mode":
+                    self._mode = value
+                case "fanSpeed":
+                    self._fan_speed = value
+                case "tempTarget":
+                    self._target_temperature = value
+                case "enabledZones":
+                    self._zone_mask = zones_to_mask(value)
+
+    def to_dict(self) -> dict:
+        """Convert the device details and last status to a serializable dictionary."""
+        return {
+            "block_id": self._block_id,
+            "mac": self._mac,
+            "device_id": self._device_id,
+            "firmware_version": self._firmwareVersion,
+            "status": {
+                "isOn": self._is_on,
+                "mode": self._mode,
+                "fanSpeed": self._fan_speed,
+                "setPoint": self._target_temperature,
+                "roomTemp_oC": self._current_temperature,
+                "isInESP_Mode": self._is_esp_on,
+                "fanIsCont": self._is_fan_continuous,
+                "compressorActivity": self._compressor_activity,
+                "enabledZones": self.enabled_zones,
+            },
+        }
+
+    def restore(self, data: dict) -> None:
+        """Restore the device details and status from a dictionary created by to_dict."""
+        self._block_id = data["block_id"]
+        self._mac = data["mac"]
+        self._device_id = data["device_id"]
+        self._firmwareVersion = data["firmware_version"]
+        self.apply_status(data["status"])
+
+    @property
+    def state(self) -> ApplianceState:
+        """Return a snapshot of the device's state."""
+        return ApplianceState(
+            is_on=self.is_on,
+            mode=self.mode,
+            fan_speed=self.fan_speed,
+            target_temperature=self.target_temperature,
+            current_temperature=self.current_temperature,
+            compressor_activity=self.compressor_activity,
+            is_esp_on=self.is_esp_on,
+            is_fan_continuous=self.is_fan_continuous,
+            enabled_zones=tuple(self.enabled_zones),
+        )
+
+    def _publish_state(self) -> None:
+        """Send the changes since the last published state to the subscribers."""
+        try:
+            state = self.state
+        except AttributeError:
+            # commands can be sent before the first status update
+            return
+        changed = state.diff(self._state)
+        if not changed:
+            return
+        delta = StateDelta(state, self._state, changed)
+        self._state = state
+
+        for queue in self._subscribers:
+            # drop the oldest delta rather than blocking the device on a slow subscriber, its
+            # changes are merged into the next one so only the state in between is missed
+            if queue.full():
+                dropped = queue.get_nowait()
+                queue.put_nowait(StateDelta(state, dropped.previous, dropped.changed | changed))
+                _LOGGER.debug("Dropped a state change for a slow subscriber of %s", self.hostname)
+                continue
+            queue.put_nowait(delta)
+
+    async def watch(
+        self, poll_interval: Optional[float] = None, queue_size: int = WATCH_QUEUE_SIZE
+    ) -> AsyncIterator[StateDelta]:
+        """Yield state changes as they happen.
+
+        Changes come from any status update: polling by the owner of the appliance, push
+        sources calling apply_status and commands. When poll_interval is given, the device
+        is also polled at that interval while the subscription is active, one poll loop at
+        the shortest requested interval is shared by all subscribers.
+        """
+        queue: asyncio.Queue[StateDelta] = asyncio.Queue(maxsize=queue_size)
+        self._subscribers.add(queue)
+        if self._state is not None:
+            queue.put_nowait(StateDelta(self._state, None, self._state.diff(None)))
+        if poll_interval is not None:
+            self._poll_intervals.append(poll_interval)
+            if self._poll_task is None:
+                self._poll_task = asyncio.create_task(self._poll())
 
-    async def _get_resource(self, path: str, params: Optional[dict] = None):
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.discard(queue)
+            if poll_interval is not None:
+                self._poll_intervals.remove(poll_interval)
+                if not self._poll_intervals and self._poll_task is not None:
+                    self._poll_task.cancel()
+                    self._poll_task = None
+
+    async def _poll(self) -> None:
+        """Poll the device for the watch subscribers."""
+        loop = asyncio.get_running_loop()
+        while self._poll_intervals:
+            started = loop.time()
+            try:
+                await self.update_status()
+            except ActronException:
+                # already logged, the next poll will try again
+                pass
+            except Exception:  # pylint: disable=broad-except
+                # the loop is shared by every subscriber, it must keep going
+                _LOGGER.exception("Unexpected error while polling %s", self.hostname)
+            await asyncio.sleep(max(0.0, min(self._poll_intervals) - (loop.time() - started)))
+
+    async def _get_resource(
+        self, path: str, params: Optional[dict] = None, priority: RequestPriority = RequestPriority.POLL
+    ):
         """Make the http request."""
         if params is None:
             params = {}
@@ -177,8 +445,8 @@ class Appliance:  # pylint: disable=too-many-public-methods
 
         # cannot manage session on outer async with or this will close the session
         # passed to pyactron (homeassistant for instance)
-        async with self.request_semaphore:
-            async with self.session.get(
+        async with self.request_scheduler.slot(priority):
+            async with CLIENT_METRICS.measure(Operation.GET_RESOURCE), self.session.get(
                 f'{self.base_url}/{path}',
                 params=params,
             ) as response:
@@ -207,58 +475,97 @@ class Appliance:  # pylint: disable=too-many-public-methods
 
     async def _get_block_id_from_remote_service(self) -> str:
         """Get the block id from the remote service."""
-        service_url = f'https://{self.service_configuration.ninja_service_host}/rest/v0/devices?user_access_token={self.user.user_access_token}'
+        service_url = f'{self.service_configuration.ninja_service_url}/rest/v0/devices?user_access_token={self.user.user_access_token}'
         _LOGGER.debug("Loading service configuration from: %s", service_url)
 
         try:
-            async with self.session.get(
-                service_url,
-            ) as response:
-                if response.status != 200:
-                    _LOGGER.debug(
-                        "Unexpected HTTP status code %s for %s",
-                        response.status,
-                        response.url,
-                    )
-                response.raise_for_status()
+            response = await self.service_configuration.cloud.get(service_url, Operation.GET_BLOCK_ID)
+        except ActronException as e:
+            _LOGGER.error("Error while fetching the block id: %s", e)
+            raise
 
-                block_id = self._extract_block_id_from_response(await response.text())
+        block_id = self._extract_block_id_from_response(response)
 
-                if block_id is None:
-                    raise ActronException("Failed to get block id")
+        if block_id is None:
+            raise ActronResponseError("Failed to get block id")
 
-                return block_id
-               
-        except Exception as e:
-            _LOGGER.error("Unexpected error while fetching the block id: %s", e)
-            raise ActronException(f"Unexpected error: {e}") from e
+        return block_id
 
     async def _send_ninja_command(self, block_id: str, payload: str) -> None:
         """Send a command to the Ninja service."""
-        url = f'https://{self.service_configuration.ninja_service_host}/rest/v0/device/{block_id}?user_access_token={self.user.user_access_token}'
+        url = f'{self.service_configuration.ninja_service_url}/rest/v0/device/{block_id}?user_access_token={self.user.user_access_token}'
 
         try:
-            async with self.session.put(
-                url,
-                headers={'Content-Type': 'application/json'},
-                data=payload,
-            ) as response:
-                if response.status != 200:
-                    _LOGGER.error(
-                        "Unexpected HTTP status code when sending a ninja command: %s for %s",
-                        response.status,
-                        response.url,
-                    )
-                response.raise_for_status()
-            
-            # skip the update for a few seconds to avoid the state going back and forth
-            self._skip_update_until = datetime.now() + timedelta(seconds=DEVICE_UPDATE_SKIP_SECONDS)
-        except Exception as e:
-            _LOGGER.error("Unexpected error while sending a ninja command: %s", e)
-            raise ActronException(f"Unexpected error: {e}") from e
+            await self.service_configuration.cloud.put(url, payload, Operation.SEND_NINJA_COMMAND)
+        except ActronException as e:
+            _LOGGER.error("Error while sending a ninja command: %s", e)
+            raise
+
+        # skip the update for a few seconds to avoid the state going back and forth
+        self._skip_update_until = datetime.now() + timedelta(seconds=DEVICE_UPDATE_SKIP_SECONDS)
+
+    async def _send_da(self, command: dict) -> None:
+        """Send a DA command to the Ninja service, remembering it until the device has it."""
+        if self._skip_update_until < datetime.now():
+            # the commands sent before the last skip window reached the device by now
+            self._recent_command = {}
+        await self._send_ninja_command(self._block_id, json.dumps({"DA": command}))
+        self._recent_command = {**self._recent_command, **command}
+
+    async def _send_command(self, command: dict) -> None:
+        """Send a DA command, or keep it in the journal if the Ninja service is unreachable."""
+        if self.command_journal is None:
+            await self._send_da(command)
+            return
+
+        if self.command_journal:
+            # the service was unreachable, send the commands in the journal with this one
+            self.command_journal.record(command)
+            if await self.replay_commands():
+                return
+        else:
+            try:
+                await self._send_da(command)
+                return
+            except ActronException as e:
+                if not _is_unreachable(e):
+                    raise
+            self.command_journal.record(command)
+
+        _LOGGER.warning("Ninja service unreachable, command kept until it is back: %s", command)
+
+    async def replay_commands(self) -> bool:
+        """Send the net result of the commands in the journal as one DA command.
+
+        Return True if the journal is empty afterwards. Commands the service rejects are
+        dropped, commands are kept while it is unreachable.
+        """
+        if self.command_journal is None:
+            return True
+
+        # a replay waiting for another one only sends what was added in the meantime
+        async with self._replay_lock:
+            command = self.command_journal.pending()
+            if not command:
+                return True
+
+            try:
+                await self._send_da(command)
+            except ActronException as e:
+                if _is_unreachable(e):
+                    return False
+                _LOGGER.error("Dropped the commands kept while the Ninja service was unreachable: %s", command)
+                self.command_journal.discard(command)
+                raise
+
+            self.command_journal.discard(command)
+            _LOGGER.info("Sent the commands kept while the Ninja service was unreachable: %s", command)
+            return not self.command_journal
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode):
         """Set new target hvac mode."""
+        hvac_mode = HVACMode(hvac_mode)
+
         # turn off the device if the mode is off
         if hvac_mode == HVACMode.OFF:
             await self.async_turn_off()
@@ -268,45 +575,92 @@ class Appliance:  # pylint: disable=too-many-public-methods
         if not self.is_on:
             await self.async_turn_on()
 
-        payload = f'{{"DA":{{"mode":{HVACMODE_TO_ACTRON[hvac_mode]} }}}}'
-        await self._send_ninja_command(self._block_id, payload)
+        await self._send_command({"mode": HVACMODE_TO_ACTRON[hvac_mode]})
         self._mode = HVACMODE_TO_ACTRON[hvac_mode]
+        self._publish_state()
 
     async def async_turn_on(self):
         """Turn the entity on."""
-        payload = '{"DA":{"amOn":1} }'
-        await self._send_ninja_command(self._block_id, payload)
+        await self._send_command({"amOn": 1})
         self._is_on = True
+        self._publish_state()
 
     async def async_turn_off(self):
         """Turn the entity off."""
-        payload = '{"DA":{"amOn":0} }'
-        await self._send_ninja_command(self._block_id, payload)
+        await self._send_command({"amOn": 0})
         self._is_on = False
+        self._publish_state()
 
     async def async_set_fan_mode(self, fan_mode: str):
         """Set new target fan mode."""
-        payload = f'{{"DA":{{"fanSpeed":{FAN_SPEED_STRING_TO_ACTRON[fan_mode]} }}}}'
-        await self._send_ninja_command(self._block_id, payload)
+        await self._send_command({"fanSpeed": FAN_SPEED_STRING_TO_ACTRON[fan_mode]})
         self._fan_speed = FAN_SPEED_STRING_TO_ACTRON[fan_mode]
+        self._publish_state()
 
     async def async_set_temperature(self, target_temperature: float):
         """Set new target temperature."""
-        payload = f'{{"DA":{{"tempTarget":{target_temperature} }}}}'
-        await self._send_ninja_command(self._block_id, payload)
+        await self._send_command({"tempTarget": target_temperature})
         self._target_temperature = target_temperature
+        self._publish_state()
 
     async def async_zone_turn_on(self, zone_id: int):
         """Set zone status."""
-        self._enabled_zones[zone_id] = 1
-        payload = f'{{"DA":{{"enabledZones":{json.dumps(self._enabled_zones)} }}}}'
-        await self._send_ninja_command(self._block_id, payload)
+        await self._async_set_zone(zone_id, True)
 
     async def async_zone_turn_off(self, zone_id: int):
         """Set zone status."""
-        self._enabled_zones[zone_id] = 0
-        payload = f'{{"DA":{{"enabledZones":{json.dumps(self._enabled_zones)} }}}}'
-        await self._send_ninja_command(self._block_id, payload)
+        await self._async_set_zone(zone_id, False)
+
+    async def _async_set_zone(self, zone_id: int, enabled: bool):
+        """Change one zone, merging concurrent zone changes into a single command.
+
+        The enabledZones command always carries the whole zone layout. Changes made while
+        a zone command is in flight are gathered in one edit, which is applied to the
+        zone layout as it is when the edit is sent, so concurrent changes never
+        overwrite each other. If the command fails, the zones it changed are rolled back.
+        The edit is sent by its own task, so a caller being cancelled does not drop the
+        changes of the others.
+        """
+        edit = self._zone_edit
+        if edit is None:
+            edit = self._zone_edit = ZoneEdit(asyncio.get_running_loop().create_future())
+            task = asyncio.create_task(self._send_zone_edit(edit))
+            self._zone_tasks.add(task)
+            task.add_done_callback(self._zone_tasks.discard)
+        edit.set(zone_id, enabled)
+
+        # the change is sent with the edit, and shares its outcome
+        await asyncio.shield(edit.done)
+
+    async def _send_zone_edit(self, edit: ZoneEdit) -> None:
+        """Send a zone edit once the previous one completed."""
+        try:
+            async with self._zone_lock:
+                # later changes go into a new edit, sent once this one completes
+                self._zone_edit = None
+
+                previous_mask = self._zone_mask
+                self._zone_mask = edit.apply(previous_mask)
+                self._publish_state()
+
+                try:
+                    await self._send_command({"enabledZones": self.enabled_zones})
+                except BaseException:
+                    self._zone_mask = (self._zone_mask & ~edit.changed) | (previous_mask & edit.changed)
+                    self._publish_state()
+                    raise
+        except asyncio.CancelledError:
+            edit.done.cancel()
+            raise
+        except Exception as e:  # pylint: disable=broad-except
+            edit.done.set_exception(e)
+            # mark the exception as retrieved, the callers might all have been cancelled
+            edit.done.exception()
+        else:
+            edit.done.set_result(None)
+        finally:
+            if self._zone_edit is edit:
+                self._zone_edit = None
 
     @property
     def manufacturer(self) -> str:
@@ -384,7 +738,11 @@ class Appliance:  # pylint: disable=too-many-public-methods
     @property
     def enabled_zones(self) -> list[int]:
         """Return device's enabled zones."""
-        return self._enabled_zones
+        return mask_to_zones(self._zone_mask, self._zone_count)
+
+    def is_zone_enabled(self, zone_id: int) -> bool:
+        """Return True if a zone is enabled."""
+        return bool(self._zone_mask >> zone_id & 1)
 
     @property
     def zone_names(self) -> list[str]:
@@ -0,0 +1,145 @@
+"""Fault injection harness for pyactron.
+
+Polls a simulated unit the way ``ActronCoordinator`` does, injects one class of
+fault at a time in the simulated controller or Ninja service, and measures for
+each one:
+
+- how long after the fault clears the appliance has fresh data again,
+- how many status requests were wasted until then,
+- how many polls failed.
+
+Run it from the integration folder::
+
+    python -m pyactron.chaos --interval 1 --fault-duration 5
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import time
+
+from aiohttp import ClientSession
+
+from .appliance import Appliance
+from .service_configuration import ServiceConfiguration
+from .simulator import Fault, SimulatedFleet, SimulatorThread
+
+# the polling loop gives up waiting for fresh data after this long
+RECOVERY_TIMEOUT_SECONDS = 120
+
+SCENARIOS: dict[str, tuple[str, Fault]] = {
+    "latency spike": ("status", Fault(delay=5.0)),
+    "403 forbidden": ("status", Fault(status=403)),
+    "invalid json": ("status", Fault(truncate=True)),
+    "dropped connection": ("status", Fault(drop=True)),
+    "slow put": ("command", Fault(delay=10.0)),
+}
+
+
+@dataclass
+class ChaosResult:
+    """Measurements for one fault class."""
+
+    scenario: str
+    recovered: bool
+    recovery_seconds: float
+    wasted_requests: int
+    failed_polls: int
+
+    HEADER = f"{'scenario':<20} {'recovery s':>10} {'wasted':>7} {'failed':>7}"
+
+    def __str__(self) -> str:
+        """Format the result as a table row."""
+        recovery = f"{self.recovery_seconds:>10.2f}" if self.recovered else f"{'timeout':>10}"
+        return f"{self.scenario:<20} {recovery} {self.wasted_requests:>7} {self.failed_polls:>7}"
+
+
+async def _poll(device: Appliance, interval: float, counters: dict) -> None:
+    """Poll the appliance, as the coordinator would: one refresh at a time."""
+    while True:
+        try:
+            await device.update_status()
+        except Exception:  # pylint: disable=broad-except
+            # the coordinator marks the update as failed and tries again on the next interval
+            counters["failed"] += 1
+        await asyncio.sleep(interval)
+
+
+async def run_scenario(
+    fleet: SimulatedFleet,
+    session: ClientSession,
+    index: int,
+    name: str,
+    interval: float,
+    fault_duration: float,
+) -> ChaosResult:
+    """Inject one fault in a unit of the fleet and measure the recovery."""
+    kind, fault = SCENARIOS[name]
+    unit = fleet.units[index]
+    service_configuration = ServiceConfiguration(session, ninja_service_host=fleet.ninja_service_host)
+    device = Appliance(fleet.controller_host(index), service_configuration, unit.user(), session)
+    await device.init()
+
+    counters = {"failed": 0}
+    poll_task = asyncio.create_task(_poll(device, interval, counters))
+    command_task = None
+    try:
+        await asyncio.sleep(interval * 2)
+
+        status_requests = fleet.requests["status"]
+        fleet.faults[kind] = fault
+        if kind == "command":
+            command_task = asyncio.create_task(device.async_set_temperature(unit.status["setPoint"] + 1))
+        await asyncio.sleep(fault_duration)
+        del fleet.faults[kind]
+        if command_task is not None:
+            # a command sent during the fault can outlast it, the recovery is measured from the
+            # end of the command, so it includes the skip window that follows
+            await asyncio.gather(command_task, return_exceptions=True)
+
+        # data is fresh once the appliance reports a value set after the fault cleared
+        fresh_temperature = unit.status["roomTemp_oC"] + 0.5
+        unit.status["roomTemp_oC"] = fresh_temperature
+        cleared = time.monotonic()
+        recovered = False
+        while time.monotonic() - cleared < RECOVERY_TIMEOUT_SECONDS:
+            if device.current_temperature == fresh_temperature:
+                recovered = True
+                break
+            await asyncio.sleep(0.01)
+        recovery_seconds = time.monotonic() - cleared
+        # every status request but the one delivering fresh data was wasted
+        wasted_requests = fleet.requests["status"] - status_requests - (1 if recovered else 0)
+    finally:
+        fleet.faults.pop(kind, None)
+        poll_task.cancel()
+        if command_task is not None:
+            command_task.cancel()
+        await asyncio.gather(poll_task, *([command_task] if command_task else []), return_exceptions=True)
+
+    return ChaosResult(name, recovered, recovery_seconds, wasted_requests, counters["failed"])
+
+
+async def _main(scenarios: list[str], interval: float, fault_duration: float) -> None:
+    # every scenario gets its own unit, so no state carries over from one to the next
+    with SimulatorThread(SimulatedFleet(len(scenarios))) as fleet:
+        print(ChaosResult.HEADER)
+        for index, name in enumerate(scenarios):
+            async with ClientSession() as session:
+                result = await run_scenario(fleet, session, index, name, interval, fault_duration)
+            print(result, flush=True)
+
+
+def main() -> None:
+    """Run the fault injection harness from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="defaults to all scenarios")
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds between polls")
+    parser.add_argument("--fault-duration", type=float, default=30.0, help="seconds each fault is injected for")
+    args = parser.parse_args()
+
+    asyncio.run(_main(args.scenario or list(SCENARIOS), args.interval, args.fault_duration))
+
+
+if __name__ == "__main__":
+    main()
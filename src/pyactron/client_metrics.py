@@ -0,0 +1,112 @@
+"""Metrics of the HTTP requests made by pyactron."""
+
+from array import array
+from bisect import bisect_left
+from enum import IntEnum
+import time
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Operation(IntEnum):
+    """HTTP operations of the client."""
+
+    GET_RESOURCE = 0
+    SEND_NINJA_COMMAND = 1
+    GET_BLOCK_ID = 2
+    GET_SERVICE_CONFIGURATION = 3
+    LOGIN = 4
+
+    @property
+    def label(self) -> str:
+        """Return the label value of the operation."""
+        return self.name.lower()
+
+
+class ClientMetrics:
+    """Request counts, errors and latencies per operation."""
+
+    def __init__(self) -> None:
+        """Init the metrics."""
+        count = len(Operation)
+        self.requests = array("Q", [0] * count)
+        self.errors = array("Q", [0] * count)
+        self.latency_sum = array("d", [0.0] * count)
+        # one row of bucket counts per operation, the last bucket is +Inf
+        self.latency_buckets = array("Q", [0] * (count * (len(LATENCY_BUCKETS) + 1)))
+
+    def observe(self, operation: Operation, seconds: float, error: bool) -> None:
+        """Record one request."""
+        self.requests[operation] += 1
+        if error:
+            self.errors[operation] += 1
+        self.latency_sum[operation] += seconds
+        self.latency_buckets[operation * (len(LATENCY_BUCKETS) + 1) + bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def measure(self, operation: Operation) -> "Measurement":
+        """Return a context manager recording the request made in it."""
+        return Measurement(self, operation)
+
+    def render(self, lines: list[str]) -> None:
+        """Append the metrics in the OpenMetrics text format."""
+        lines.append("# TYPE actron_client_requests counter")
+        lines.append("# HELP actron_client_requests HTTP requests made by the client.")
+        lines.extend(
+            f'actron_client_requests_total{{operation="{operation.label}"}} {self.requests[operation]}'
+            for operation in Operation
+        )
+        lines.append("# TYPE actron_client_errors counter")
+        lines.append("# HELP actron_client_errors HTTP requests of the client that failed.")
+        lines.extend(
+            f'actron_client_errors_total{{operation="{operation.label}"}} {self.errors[operation]}'
+            for operation in Operation
+        )
+        lines.append("# TYPE actron_client_request_duration_seconds histogram")
+        lines.append("# UNIT actron_client_request_duration_seconds seconds")
+        lines.append("# HELP actron_client_request_duration_seconds Duration of the HTTP requests of the client.")
+        row_length = len(LATENCY_BUCKETS) + 1
+        for operation in Operation:
+            label = operation.label
+            cumulative = 0
+            for index, bound in enumerate((*LATENCY_BUCKETS, "+Inf")):
+                cumulative += self.latency_buckets[operation * row_length + index]
+                lines.append(
+                    f'actron_client_request_duration_seconds_bucket{{operation="{label}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'actron_client_request_duration_seconds_count{{operation="{label}"}} {cumulative}')
+            lines.append(
+                f'actron_client_request_duration_seconds_sum{{operation="{label}"}} {self.latency_sum[operation]}'
+            )
+
+
+
+class Measurement:
+    """Record the duration and outcome of a request, as a sync or async context manager."""
+
+    __slots__ = ("metrics", "operation", "started")
+
+    def __init__(self, metrics: ClientMetrics, operation: Operation) -> None:
+        """Init the measurement."""
+        self.metrics = metrics
+        self.operation = operation
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        """Start measuring."""
+        self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        """Record the request."""
+        self.metrics.observe(self.operation, time.perf_counter() - self.started, exc_type is not None)
+
+    async def __aenter__(self) -> None:
+        """Start measuring."""
+        self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        """Record the request."""
+        self.__exit__(exc_type, exc, traceback)
+
+
+# shared by every client of the process, the HTTP requests of pyactron record into it
+CLIENT_METRICS = ClientMetrics()
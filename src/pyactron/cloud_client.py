@@ -0,0 +1,118 @@
+"""HTTP client for the Actron cloud services."""
+
+import asyncio
+from collections.abc import Callable
+import logging
+
+from aiohttp import ClientConnectionError, ClientError, ClientSession, ClientTimeout, TCPConnector
+
+from .client_metrics import CLIENT_METRICS, Operation
+from .exceptions import (
+    ActronAuthenticationError,
+    ActronConnectionError,
+    ActronResponseError,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOUD_REQUEST_TIMEOUT_SECONDS = 30
+# connections idle for longer than the keep-alive timeout of the session are closed, aiohttp
+# defaults to 15 seconds so warming up more often keeps a connection open
+KEEP_WARM_INTERVAL_SECONDS = 12
+# connections are only kept warm for this long after a command, follow-up commands are
+# likely then, otherwise the keep-alive of the connector is relied on
+KEEP_WARM_WINDOW_SECONDS = 300
+# used by sessions created with create_session
+KEEPALIVE_TIMEOUT_SECONDS = 300
+DNS_CACHE_SECONDS = 300
+
+
+def create_session() -> ClientSession:
+    """Create a session suited to the cloud services, for use outside Home Assistant."""
+    connector = TCPConnector(
+        keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_SECONDS,
+    )
+    return ClientSession(connector=connector)
+
+
+class CloudClient:
+    """Make requests to the Actron cloud services, mapping failures to typed exceptions.
+
+    Connections are reused across requests by the session's connection pool. For a
+    while after a command, keep_warm stops the pool from closing them while idle, so
+    follow-up commands do not have to wait for a new TCP and TLS handshake.
+    """
+
+    def __init__(self, session: ClientSession) -> None:
+        """Init the client."""
+        self.session = session
+        self.timeout = ClientTimeout(total=CLOUD_REQUEST_TIMEOUT_SECONDS)
+        # event loop times of the last command and the last request
+        self._last_command = float("-inf")
+        self._last_request = float("-inf")
+
+    async def get(self, url: str, operation: Operation) -> str:
+        """Make a GET request, returning the body."""
+        return await self.request("GET", url, operation)
+
+    async def put(self, url: str, payload: str, operation: Operation) -> str:
+        """Make a PUT request with a JSON payload, returning the body."""
+        self._last_command = asyncio.get_running_loop().time()
+        return await self.request(
+            "PUT", url, operation, headers={"Content-Type": "application/json"}, data=payload
+        )
+
+    async def post(self, url: str, operation: Operation, **kwargs) -> str:
+        """Make a POST request, returning the body."""
+        return await self.request("POST", url, operation, **kwargs)
+
+    async def request(self, method: str, url: str, operation: Operation, **kwargs) -> str:
+        """Make a request, returning the body."""
+        self._last_request = asyncio.get_running_loop().time()
+        try:
+            async with CLIENT_METRICS.measure(operation), self.session.request(
+                method, url, timeout=self.timeout, **kwargs
+            ) as response:
+                # the query string holds the user access token, keep it out of messages
+                location = f"{response.url.host}{response.url.path}"
+                if response.status in (401, 403):
+                    raise ActronAuthenticationError(f"HTTP {response.status} for {method} {location}")
+                if response.status != 200:
+                    raise ActronResponseError(
+                        f"Unexpected HTTP status code {response.status} for {method} {location}", response.status
+                    )
+                return await response.text()
+        except asyncio.TimeoutError as e:
+            raise ActronConnectionError(f"Timeout for {method} {operation.label}") from e
+        except ClientConnectionError as e:
+            raise ActronConnectionError(f"Network error for {method} {operation.label}: {e}") from e
+        except ClientError as e:
+            raise ActronResponseError(f"Invalid response for {method} {operation.label}: {e}") from e
+
+    async def warm_up(self, url: str) -> None:
+        """Open a connection to the host of a URL, if none is open already."""
+        try:
+            async with self.session.head(url, timeout=self.timeout):
+                pass
+        except (asyncio.TimeoutError, ClientError) as e:
+            _LOGGER.debug("Failed to warm up the connection to %s: %s", url, e)
+
+    async def keep_warm(
+        self,
+        url: Callable[[], str],
+        interval: float = KEEP_WARM_INTERVAL_SECONDS,
+        window: float = KEEP_WARM_WINDOW_SECONDS,
+    ) -> None:
+        """Keep a connection to the host of a URL open after commands, until cancelled.
+
+        The URL is a callable, so a refreshed service configuration is picked up.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            now = loop.time()
+            # a request within the interval already kept the connection open
+            if now - self._last_command < window and now - self._last_request >= interval:
+                await self.warm_up(url())
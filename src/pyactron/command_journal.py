@@ -0,0 +1,66 @@
+"""Journal of the commands that could not be sent to the Ninja service."""
+
+from collections.abc import Callable
+import time
+from typing import Any, Optional
+
+from .const import COMMAND_JOURNAL_MAX_AGE_SECONDS
+
+
+class CommandJournal:
+    """Commands waiting for the Ninja service to be reachable again.
+
+    Commands are kept per "DA" key, a later command replaces an earlier one for the
+    same key, so only the net result is sent when the service is back. Commands older
+    than max_age are dropped rather than applied long after they were given.
+    """
+
+    def __init__(self, max_age: float = COMMAND_JOURNAL_MAX_AGE_SECONDS) -> None:
+        """Init the journal."""
+        self.max_age = max_age
+        # called when the journal changes, to persist it
+        self.on_change: Optional[Callable[[], None]] = None
+        self._commands: dict[str, tuple[Any, float]] = {}
+
+    def __bool__(self) -> bool:
+        """Return True if commands are waiting."""
+        return bool(self._commands)
+
+    def record(self, command: dict) -> None:
+        """Add the values of a DA command, replacing earlier values of the same keys."""
+        now = time.time()
+        for key, value in command.items():
+            # re-inserting moves the key last, so values are sent in the order given
+            self._commands.pop(key, None)
+            self._commands[key] = (value, now)
+        self._changed()
+
+    def pending(self) -> dict:
+        """Return the net DA command to send, dropping expired values."""
+        expired_before = time.time() - self.max_age
+        expired = [key for key, (_, queued_at) in self._commands.items() if queued_at < expired_before]
+        for key in expired:
+            del self._commands[key]
+        if expired:
+            self._changed()
+        return {key: value for key, (value, _) in self._commands.items()}
+
+    def discard(self, command: dict) -> None:
+        """Remove the values that were sent, keeping the ones replaced since."""
+        sent = [key for key, value in command.items() if key in self._commands and self._commands[key][0] == value]
+        for key in sent:
+            del self._commands[key]
+        if sent:
+            self._changed()
+
+    def to_dict(self) -> dict:
+        """Convert the journal to a serializable dictionary."""
+        return {key: [value, queued_at] for key, (value, queued_at) in self._commands.items()}
+
+    def restore(self, data: dict) -> None:
+        """Restore the journal from a dictionary created by to_dict."""
+        self._commands = {key: (value, queued_at) for key, (value, queued_at) in data.items()}
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
@@ -0,0 +1,49 @@
+"""Constants for pyactron."""
+
+from enum import IntEnum, StrEnum
+
+# updating the state of the device can take some time to propagate to the actual device,
+# local status updates are skipped for this long after a command is sent
+DEVICE_UPDATE_SKIP_SECONDS = 20
+
+# commands given while the Ninja service is unreachable are dropped after this long
+COMMAND_JOURNAL_MAX_AGE_SECONDS = 15 * 60
+
+# commands sent to a group of devices: how many are in flight at once, and how many
+# times a device is tried, waiting longer between each attempt
+GROUP_MAX_CONCURRENT_COMMANDS = 8
+GROUP_COMMAND_ATTEMPTS = 3
+GROUP_RETRY_DELAY_SECONDS = 1.0
+
+
+class RequestPriority(IntEnum):
+    """Priority of a request to the local controller, lower values go first."""
+
+    # a user is waiting for the result
+    INTERACTIVE = 0
+    # confirms the outcome of a command
+    CONFIRMATION = 1
+    # device details, fetched once when the device is initialized
+    INFO = 2
+    # routine refresh, dropped when too many requests are waiting since the next poll supersedes it
+    POLL = 3
+
+
+# pyactron does not depend on Home Assistant, the values of these enums match the
+# HVACMode and HVACAction enums of its climate component so they can be converted
+class HVACMode(StrEnum):
+    """HVAC mode of the device."""
+
+    OFF = "off"
+    HEAT = "heat"
+    COOL = "cool"
+    HEAT_COOL = "heat_cool"
+    FAN_ONLY = "fan_only"
+
+
+class HVACAction(StrEnum):
+    """Current activity of the compressor."""
+
+    COOLING = "cooling"
+    HEATING = "heating"
+    IDLE = "idle"
@@ -0,0 +1,116 @@
+"""Discovery of Actron controllers on the local network."""
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+import ipaddress
+import json
+import logging
+
+from aiohttp import ClientSession, ClientTimeout
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_CONCURRENT_PROBES = 64
+PROBE_TIMEOUT_SECONDS = 1.5
+
+
+@dataclass(frozen=True)
+class DiscoveredController:
+    """Actron controller found on the local network."""
+
+    host: str
+    mac: str
+    device_id: str
+    firmware_version: str
+
+
+def block_id_matches(device_id: str, block_id: str) -> bool:
+    """Return True if the block id of a local controller matches a cloud block id."""
+    # the cloud can suffix the block id of the controller with its device indexes
+    return block_id == device_id or block_id.startswith(f"{device_id}_")
+
+
+class ControllerScanner:
+    """Probe hosts concurrently for Actron controllers and cache the results."""
+
+    def __init__(
+        self,
+        session: ClientSession,
+        max_concurrent_probes: int = MAX_CONCURRENT_PROBES,
+        timeout: float = PROBE_TIMEOUT_SECONDS,
+    ) -> None:
+        """Init the scanner."""
+        self.session = session
+        self.timeout = ClientTimeout(total=timeout)
+        self._semaphore = asyncio.Semaphore(max_concurrent_probes)
+        self._controllers: dict[str, DiscoveredController] = {}
+
+    @property
+    def controllers(self) -> list[DiscoveredController]:
+        """Return the controllers found so far."""
+        return list(self._controllers.values())
+
+    def find(self, block_id: str) -> DiscoveredController | None:
+        """Return the cached controller matching a cloud block id."""
+        for controller in self._controllers.values():
+            if block_id_matches(controller.device_id, block_id):
+                return controller
+        return None
+
+    async def locate(self, block_id: str) -> DiscoveredController | None:
+        """Return the cached controller matching a cloud block id, if it still answers there."""
+        controller = self.find(block_id)
+        if controller is None:
+            return None
+        # DHCP can move a controller to another address, so the cached one is probed again
+        probed = await self.probe(controller.host)
+        if probed is not None and block_id_matches(probed.device_id, block_id):
+            return probed
+        if self._controllers.get(controller.device_id) == controller:
+            del self._controllers[controller.device_id]
+        return None
+
+    async def scan_network(self, network: str) -> list[DiscoveredController]:
+        """Probe every host of an IPv4 network."""
+        hosts = ipaddress.ip_network(network, strict=False).hosts()
+        return await self.scan_hosts(str(host) for host in hosts)
+
+    async def scan_hosts(self, hosts: Iterable[str]) -> list[DiscoveredController]:
+        """Probe hosts concurrently, returning the controllers found."""
+        results = await asyncio.gather(*(self.probe(host) for host in hosts))
+        return [controller for controller in results if controller is not None]
+
+    async def probe(self, host: str) -> DiscoveredController | None:
+        """Probe a single host, returning the controller if it is one."""
+        controller = await self._probe(host)
+        if controller is None:
+            # forget any controller cached at this address, it is no longer there
+            for device_id in [device_id for device_id, cached in self._controllers.items() if cached.host == host]:
+                del self._controllers[device_id]
+            return None
+
+        _LOGGER.debug("Found controller %s at %s", controller.device_id, host)
+        self._controllers[controller.device_id] = controller
+        return controller
+
+    async def _probe(self, host: str) -> DiscoveredController | None:
+        async with self._semaphore:
+            try:
+                async with self.session.get(f"http://{host}/1.json", timeout=self.timeout) as response:
+                    if response.status != 200:
+                        return None
+                    data = json.loads(await response.text())
+                controller = DiscoveredController(
+                    host=host,
+                    mac=data["MacAddress"],
+                    device_id=data["BlockID"],
+                    firmware_version=data.get("firmwareVersion", ""),
+                )
+            except (asyncio.TimeoutError, OSError, ValueError, KeyError, TypeError):
+                return None
+            except Exception as e:  # pylint: disable=broad-except
+                # anything listening on port 80 can answer, none of it is fatal to a scan
+                _LOGGER.debug("Error probing %s: %s", host, e)
+                return None
+        return controller
@@ -2,3 +2,24 @@
 
 class ActronException(Exception):
     """Actron base exception class."""
+
+
+class ActronConnectionError(ActronException):
+    """The service could not be reached, or did not answer in time."""
+
+
+class ActronAuthenticationError(ActronException):
+    """The service rejected the credentials or the access token."""
+
+
+class ActronResponseError(ActronException):
+    """The service answered with an unexpected status or content."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """Init the exception."""
+        super().__init__(message)
+        self.status = status
+
+
+class ActronRequestDropped(ActronException):
+    """The request was dropped because too many requests were waiting for the device."""
@@ -0,0 +1,94 @@
+"""Send one command to a group of appliances concurrently."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+import logging
+from typing import Optional
+
+from .appliance import Appliance
+from .const import GROUP_COMMAND_ATTEMPTS, GROUP_MAX_CONCURRENT_COMMANDS, GROUP_RETRY_DELAY_SECONDS
+from .exceptions import ActronException
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class UnitResult:
+    """Outcome of a group command for one appliance."""
+
+    device_id: str
+    success: bool = False
+    # the commands are kept in the journal of the appliance until the Ninja service is back
+    queued: bool = False
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+async def send_to_group(
+    appliances: Iterable[Appliance],
+    steps: Sequence[Callable[[Appliance], Awaitable[None]]],
+    max_concurrent: int = GROUP_MAX_CONCURRENT_COMMANDS,
+    attempts: int = GROUP_COMMAND_ATTEMPTS,
+    retry_delay: float = GROUP_RETRY_DELAY_SECONDS,
+) -> list[UnitResult]:
+    """Send the steps of a command to every appliance concurrently, returning one result per appliance.
+
+    At most max_concurrent appliances are sent to at once. Appliances that fail are tried
+    again from the step that failed, up to attempts times in total, the ones that succeeded
+    are not. Appliances that kept the command in their journal are tried again by replaying
+    it, and reported as queued rather than successful if the service is still unreachable.
+    Appliances whose queued command is rejected by the service fail without further attempts.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    results = {appliance: UnitResult(appliance.device_id) for appliance in appliances}
+    next_step = dict.fromkeys(results, 0)
+    rejected: set[Appliance] = set()
+
+    async def send(appliance: Appliance) -> None:
+        result = results[appliance]
+        async with semaphore:
+            result.attempts += 1
+            if result.queued:
+                try:
+                    if not await appliance.replay_commands():
+                        return
+                except ActronException as e:
+                    # the journal dropped the command, sending it again would be rejected too
+                    result.queued = False
+                    result.error = str(e)
+                    rejected.add(appliance)
+                    return
+                result.queued = False
+            try:
+                for index in range(next_step[appliance], len(steps)):
+                    await steps[index](appliance)
+                    next_step[appliance] = index + 1
+            except ActronException as e:
+                result.error = str(e)
+                return
+        if appliance.command_journal:
+            result.queued = True
+            result.error = "Ninja service unreachable"
+            return
+        result.success = True
+        result.error = None
+
+    pending = list(results)
+    for attempt in range(attempts):
+        if attempt:
+            _LOGGER.debug("Retrying the group command for %d devices", len(pending))
+            await asyncio.sleep(retry_delay * 2 ** (attempt - 1))
+        await asyncio.gather(*(send(appliance) for appliance in pending))
+        pending = [
+            appliance for appliance in pending if not results[appliance].success and appliance not in rejected
+        ]
+        if not pending:
+            break
+
+    for appliance in [*pending, *rejected]:
+        if results[appliance].queued:
+            _LOGGER.warning("Group command for %s kept until the Ninja service is back", appliance.device_id)
+        else:
+            _LOGGER.error("Group command failed for %s: %s", appliance.device_id, results[appliance].error)
+    return list(results.values())
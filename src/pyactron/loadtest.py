@@ -0,0 +1,186 @@
+"""Fleet-scale load test for pyactron.
+
+Attaches N appliances to simulated controllers and a simulated Ninja service, polls
+them the way ``ActronCoordinator`` does and reports, for each fleet size:
+
+- event loop lag (how late a periodic timer fires),
+- memory allocated per initialized appliance,
+- completed polls per second,
+- command latency.
+
+The simulator runs on its own thread and event loop so its work does not show up
+as lag in the loop being measured. Run it from the integration folder::
+
+    python -m pyactron.loadtest --sizes 10,100,500 --duration 30
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import random
+import statistics
+import time
+import tracemalloc
+
+from aiohttp import ClientSession, TCPConnector
+
+from .appliance import Appliance
+from .service_configuration import ServiceConfiguration
+from .simulator import SimulatedFleet, SimulatorThread
+
+# same limits as the Home Assistant shared client session
+MAXIMUM_CONNECTIONS = 4096
+MAXIMUM_CONNECTIONS_PER_HOST = 100
+
+LAG_SAMPLE_INTERVAL = 0.05
+
+
+@dataclass
+class LoadTestResult:
+    """Measurements for one fleet size."""
+
+    appliances: int
+    init_seconds: float
+    memory_per_appliance_kib: float
+    polls_per_second: float
+    poll_errors: int
+    lag_p50_ms: float
+    lag_p99_ms: float
+    lag_max_ms: float
+    command_count: int
+    command_p50_ms: float
+    command_p99_ms: float
+
+    HEADER = (
+        f"{'units':>6} {'init s':>7} {'KiB/unit':>9} {'polls/s':>8} {'errors':>6} "
+        f"{'lag p50':>8} {'lag p99':>8} {'lag max':>8} {'cmds':>5} {'cmd p50':>8} {'cmd p99':>8}"
+    )
+
+    def __str__(self) -> str:
+        """Format the result as a table row."""
+        return (
+            f"{self.appliances:>6} {self.init_seconds:>7.2f} {self.memory_per_appliance_kib:>9.1f} "
+            f"{self.polls_per_second:>8.1f} {self.poll_errors:>6} "
+            f"{self.lag_p50_ms:>8.1f} {self.lag_p99_ms:>8.1f} {self.lag_max_ms:>8.1f} "
+            f"{self.command_count:>5} {self.command_p50_ms:>8.1f} {self.command_p99_ms:>8.1f}"
+        )
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def _sample_lag(samples: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LAG_SAMPLE_INTERVAL
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def _poll(device: Appliance, interval: float, counters: dict, stop: asyncio.Event) -> None:
+    """Poll one appliance, as the coordinator would."""
+    # stagger the first poll, coordinators are not all created in the same instant
+    await asyncio.sleep(random.uniform(0, interval))
+    while not stop.is_set():
+        try:
+            await device.update_status()
+            counters["polls"] += 1
+        except Exception:  # pylint: disable=broad-except
+            counters["errors"] += 1
+        await asyncio.sleep(interval)
+
+
+async def _send_commands(devices: list[Appliance], rate: float, latencies: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        await asyncio.sleep(random.expovariate(rate))
+        device = random.choice(devices)
+        started = time.perf_counter()
+        try:
+            await device.async_set_temperature(random.choice([20.0, 21.0, 22.0, 23.0]))
+        except Exception:  # pylint: disable=broad-except
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run_load_test(
+    fleet: SimulatedFleet,
+    session: ClientSession,
+    appliance_count: int,
+    duration: float,
+    interval: float,
+    command_rate: float,
+) -> LoadTestResult:
+    """Attach appliances to the fleet, poll them for a while and measure."""
+    service_configuration = ServiceConfiguration(session, ninja_service_host=fleet.ninja_service_host)
+
+    # memory is only traced while the appliances are created, tracing slows everything down
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    devices = [
+        Appliance(fleet.controller_host(index), service_configuration, fleet.units[index].user(), session)
+        for index in range(appliance_count)
+    ]
+    await asyncio.gather(*(device.init() for device in devices))
+    init_seconds = time.perf_counter() - started
+    memory_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    stop = asyncio.Event()
+    counters = {"polls": 0, "errors": 0}
+    lag_samples: list[float] = []
+    command_latencies: list[float] = []
+    tasks = [asyncio.create_task(_poll(device, interval, counters, stop)) for device in devices]
+    tasks.append(asyncio.create_task(_sample_lag(lag_samples, stop)))
+    if command_rate > 0:
+        tasks.append(asyncio.create_task(_send_commands(devices, command_rate, command_latencies, stop)))
+
+    await asyncio.sleep(duration)
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    return LoadTestResult(
+        appliances=appliance_count,
+        init_seconds=init_seconds,
+        memory_per_appliance_kib=(memory_after - memory_before) / appliance_count / 1024,
+        polls_per_second=counters["polls"] / duration,
+        poll_errors=counters["errors"],
+        lag_p50_ms=statistics.median(lag_samples) * 1000 if lag_samples else 0.0,
+        lag_p99_ms=_percentile(lag_samples, 99) * 1000,
+        lag_max_ms=max(lag_samples, default=0.0) * 1000,
+        command_count=len(command_latencies),
+        command_p50_ms=_percentile(command_latencies, 50) * 1000,
+        command_p99_ms=_percentile(command_latencies, 99) * 1000,
+    )
+
+
+async def _main(sizes: list[int], duration: float, interval: float, command_rate: float) -> None:
+    with SimulatorThread(SimulatedFleet(max(sizes))) as fleet:
+        print(LoadTestResult.HEADER)
+        for size in sizes:
+            connector = TCPConnector(limit=MAXIMUM_CONNECTIONS, limit_per_host=MAXIMUM_CONNECTIONS_PER_HOST)
+            async with ClientSession(connector=connector) as session:
+                result = await run_load_test(fleet, session, size, duration, interval, command_rate)
+            print(result, flush=True)
+
+
+def main() -> None:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,50,100,250,500", help="comma separated fleet sizes")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run each fleet size for")
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds between polls of one appliance")
+    parser.add_argument("--command-rate", type=float, default=1.0, help="commands per second across the fleet")
+    args = parser.parse_args()
+
+    asyncio.run(_main([int(size) for size in args.sizes.split(",")], args.duration, args.interval, args.command_rate))
+
+
+if __name__ == "__main__":
+    main()
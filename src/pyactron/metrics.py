@@ -0,0 +1,146 @@
+"""OpenMetrics exporter for pyactron.
+
+Client metrics are recorded by the HTTP requests of pyactron into preallocated
+arrays (see client_metrics), and device metrics are copied into preallocated arrays
+as state changes are received, so a scrape only formats numbers.
+"""
+
+import asyncio
+from array import array
+import logging
+
+from aiohttp import web
+
+from .appliance import ACTRON_TO_FAN_SPEED_STRING, Appliance
+from .client_metrics import CLIENT_METRICS, ClientMetrics
+from .const import HVACAction, HVACMode
+from .state import ApplianceState
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+_MODES = tuple(HVACMode)
+_ACTIVITIES = tuple(HVACAction)
+_FAN_SPEEDS = tuple(ACTRON_TO_FAN_SPEED_STRING.values())
+
+
+class ApplianceMetrics:
+    """Latest telemetry of one device."""
+
+    # indexes of the gauges in values
+    IS_ON = 0
+    ROOM_TEMPERATURE = 1
+    TARGET_TEMPERATURE = 2
+    MODE = 3
+    COMPRESSOR_ACTIVITY = 4
+    FAN_SPEED = 5
+
+    def __init__(self, device_id: str) -> None:
+        """Init the metrics."""
+        self.device_id = device_id
+        self.has_state = False
+        self.values = array("d", [0.0] * 6)
+        self.zones = array("B")
+
+    def update(self, state: ApplianceState) -> None:
+        """Copy the values of a state snapshot."""
+        self.values[self.IS_ON] = state.is_on
+        self.values[self.ROOM_TEMPERATURE] = state.current_temperature
+        self.values[self.TARGET_TEMPERATURE] = state.target_temperature
+        self.values[self.MODE] = _MODES.index(state.mode)
+        self.values[self.COMPRESSOR_ACTIVITY] = _ACTIVITIES.index(state.compressor_activity)
+        self.values[self.FAN_SPEED] = _FAN_SPEEDS.index(state.fan_speed)
+        if len(self.zones) != len(state.enabled_zones):
+            self.zones = array("B", [0] * len(state.enabled_zones))
+        for zone_id, enabled in enumerate(state.enabled_zones):
+            self.zones[zone_id] = enabled
+        self.has_state = True
+
+
+def _render_state_set(lines: list[str], name: str, device_id: str, states: tuple, current: int) -> None:
+    lines.extend(
+        f'{name}{{device="{device_id}",{name}="{state}"}} {int(index == current)}'
+        for index, state in enumerate(states)
+    )
+
+
+class MetricsExporter:
+    """Serve device telemetry and client metrics as an OpenMetrics endpoint."""
+
+    def __init__(self, client_metrics: ClientMetrics = CLIENT_METRICS) -> None:
+        """Init the exporter."""
+        self.client_metrics = client_metrics
+        self.appliances: list[ApplianceMetrics] = []
+        self._tasks: list[asyncio.Task] = []
+        self._runner: web.AppRunner | None = None
+
+    def add_appliance(self, device: Appliance, poll_interval: float | None = None) -> None:
+        """Export the telemetry of a device, updated as its state changes."""
+        metrics = ApplianceMetrics(device.device_id)
+        self.appliances.append(metrics)
+
+        async def follow() -> None:
+            async for delta in device.watch(poll_interval=poll_interval):
+                metrics.update(delta.state)
+
+        self._tasks.append(asyncio.create_task(follow()))
+
+    async def start(self, host: str = "0.0.0.0", port: int = 9852) -> None:
+        """Start serving the /metrics endpoint."""
+        app = web.Application()
+        app.add_routes([web.get("/metrics", self._handle_metrics)])
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def stop(self) -> None:
+        """Stop serving and following the devices."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def render(self) -> str:
+        """Return the metrics in the OpenMetrics text format."""
+        lines: list[str] = []
+        appliances = [metrics for metrics in self.appliances if metrics.has_state]
+        gauges = (
+            ("actron_on", "Whether the device is on.", "", ApplianceMetrics.IS_ON),
+            ("actron_room_temperature_celsius", "Temperature inside.", "celsius", ApplianceMetrics.ROOM_TEMPERATURE),
+            ("actron_target_temperature_celsius", "Target temperature.", "celsius", ApplianceMetrics.TARGET_TEMPERATURE),
+        )
+        for name, description, unit, index in gauges:
+            lines.append(f"# TYPE {name} gauge")
+            if unit:
+                lines.append(f"# UNIT {name} {unit}")
+            lines.append(f"# HELP {name} {description}")
+            lines.extend(f'{name}{{device="{metrics.device_id}"}} {metrics.values[index]}' for metrics in appliances)
+
+        state_sets = (
+            ("actron_mode", "HVAC mode.", _MODES, ApplianceMetrics.MODE),
+            ("actron_compressor_activity", "Activity of the compressor.", _ACTIVITIES, ApplianceMetrics.COMPRESSOR_ACTIVITY),
+            ("actron_fan_speed", "Fan speed.", _FAN_SPEEDS, ApplianceMetrics.FAN_SPEED),
+        )
+        for name, description, states, index in state_sets:
+            lines.append(f"# TYPE {name} stateset")
+            lines.append(f"# HELP {name} {description}")
+            for metrics in appliances:
+                _render_state_set(lines, name, metrics.device_id, states, int(metrics.values[index]))
+
+        lines.append("# TYPE actron_zone_enabled gauge")
+        lines.append("# HELP actron_zone_enabled Whether a zone is enabled.")
+        for metrics in appliances:
+            lines.extend(
+                f'actron_zone_enabled{{device="{metrics.device_id}",zone="{zone_id}"}} {enabled}'
+                for zone_id, enabled in enumerate(metrics.zones)
+            )
+
+        self.client_metrics.render(lines)
+        lines.append("# EOF\n")
+        return "\n".join(lines)
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.render().encode(), headers={"Content-Type": CONTENT_TYPE})
@@ -0,0 +1,136 @@
+"""Opt-in timing of the hot paths of pyactron.
+
+Profiled functions are only wrapped while profiling is enabled, and the original
+functions are put back when it is disabled, so profiling costs nothing when off.
+"""
+
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+import functools
+import inspect
+import logging
+import time
+from typing import Any
+
+from . import appliance
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SLOW_THRESHOLD_MS = 5.0
+
+
+@dataclass(frozen=True)
+class ProfileTarget:
+    """Function to time, looked up as an attribute of a class or module."""
+
+    owner: Any
+    attribute: str
+    name: str
+
+
+# hot paths of pyactron, users of the library can add their own
+PYACTRON_TARGETS = (
+    ProfileTarget(appliance.Appliance, "update_status", "appliance.update_status"),
+    ProfileTarget(appliance.Appliance, "apply_status", "appliance.apply_status"),
+    ProfileTarget(appliance.Appliance, "_send_ninja_command", "appliance.send_ninja_command"),
+    ProfileTarget(appliance.Appliance, "_extract_block_id_from_response", "appliance.extract_block_id"),
+    ProfileTarget(appliance, "decode_json", "appliance.decode_json"),
+)
+
+
+@dataclass
+class SpanStats:
+    """Aggregated timings of one span."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    slow_count: int = 0
+
+
+class Profiler:
+    """Time spans of the profiled functions and flag slow synchronous ones.
+
+    Coroutines are timed from start to end, including the time they spend waiting.
+    Synchronous functions block the event loop for as long as they run, those taking
+    longer than the threshold are logged.
+    """
+
+    def __init__(self) -> None:
+        """Init the profiler."""
+        self.stats: dict[str, SpanStats] = {}
+        self.slow_threshold_ms = DEFAULT_SLOW_THRESHOLD_MS
+        self._patches: list[tuple[Any, str, Any]] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if profiling is enabled."""
+        return bool(self._patches)
+
+    def enable(self, targets: Iterable[ProfileTarget], slow_threshold_ms: float = DEFAULT_SLOW_THRESHOLD_MS) -> None:
+        """Start timing the targets."""
+        self.disable()
+        self.slow_threshold_ms = slow_threshold_ms
+        for target in targets:
+            original = getattr(target.owner, target.attribute)
+            # inherited attributes are deleted again rather than set on the owner
+            owned = target.attribute in vars(target.owner)
+            self._patches.append((target.owner, target.attribute, original if owned else None))
+            setattr(target.owner, target.attribute, self._wrap(target.name, original))
+
+    def disable(self) -> None:
+        """Stop timing, restoring the original functions."""
+        while self._patches:
+            owner, attribute, original = self._patches.pop()
+            if original is None:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+
+    def reset(self) -> None:
+        """Clear the aggregated timings."""
+        self.stats.clear()
+
+    def report(self) -> dict:
+        """Return the aggregated timings, slowest spans first."""
+        ordered = sorted(self.stats.items(), key=lambda item: item[1].total_ms, reverse=True)
+        return {
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "spans": {
+                name: {**asdict(stats), "mean_ms": stats.total_ms / stats.count} for name, stats in ordered
+            },
+        }
+
+    def _record(self, name: str, elapsed_ms: float, synchronous: bool) -> None:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = SpanStats()
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        if synchronous and elapsed_ms > self.slow_threshold_ms:
+            stats.slow_count += 1
+            _LOGGER.warning("%s blocked the event loop for %.1f ms", name, elapsed_ms)
+
+    def _wrap(self, name: str, function):
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    self._record(name, (time.perf_counter() - started) * 1000, False)
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._record(name, (time.perf_counter() - started) * 1000, True)
+
+        return wrapper
@@ -0,0 +1,85 @@
+"""Incremental runtime statistics for an Actron device."""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from .const import HVACAction, HVACMode
+
+ONE_HOUR = timedelta(hours=1)
+
+# time the compressor spends in each activity while the device is on
+COMPRESSOR_CATEGORIES = tuple(str(action) for action in (HVACAction.HEATING, HVACAction.COOLING, HVACAction.IDLE))
+# time the device spends on, per mode
+MODE_CATEGORIES = tuple(
+    f"on_{mode}" for mode in (HVACMode.HEAT_COOL, HVACMode.HEAT, HVACMode.COOL, HVACMode.FAN_ONLY)
+)
+RUNTIME_CATEGORIES = COMPRESSOR_CATEGORIES + MODE_CATEGORIES
+
+
+@dataclass(frozen=True)
+class HourlyRuntime:
+    """Seconds spent in each runtime category during one hour."""
+
+    start: datetime
+    seconds: dict[str, float]
+
+
+class RuntimeAccumulator:
+    """Integrate samples of the device state into hourly runtime totals.
+
+    Each sample is held until the next one, so the time between two samples is
+    attributed to the state of the first. Intervals longer than max_gap are polling
+    gaps: the state of the device during them is unknown and they are not counted.
+    Updates are O(1) per sample and only the current hour is kept in memory until it
+    is complete.
+    """
+
+    def __init__(self, max_gap: timedelta) -> None:
+        """Init the accumulator."""
+        self.max_gap = max_gap
+        self._last_time: datetime | None = None
+        self._last_categories: tuple[str, ...] = ()
+        self._hour_start: datetime | None = None
+        self._current: defaultdict[str, float] = defaultdict(float)
+        self._completed: list[HourlyRuntime] = []
+
+    def add_sample(
+        self, timestamp: datetime, is_on: bool, mode: HVACMode, compressor_activity: HVACAction
+    ) -> None:
+        """Add a sample of the device state."""
+        if self._last_time is not None and timedelta(0) < timestamp - self._last_time <= self.max_gap:
+            self._integrate(self._last_time, timestamp, self._last_categories)
+        else:
+            self._advance_hour(timestamp)
+
+        self._last_time = timestamp
+        self._last_categories = (str(compressor_activity), f"on_{mode}") if is_on else ()
+
+    def pop_completed(self) -> list[HourlyRuntime]:
+        """Return the hours completed since the last call."""
+        completed, self._completed = self._completed, []
+        return completed
+
+    def _integrate(self, start: datetime, end: datetime, categories: tuple[str, ...]) -> None:
+        while start < end:
+            self._advance_hour(start)
+            segment_end = min(end, self._hour_start + ONE_HOUR)
+            seconds = (segment_end - start).total_seconds()
+            for category in categories:
+                self._current[category] += seconds
+            start = segment_end
+        self._advance_hour(end)
+
+    def _advance_hour(self, timestamp: datetime) -> None:
+        hour_start = timestamp.replace(minute=0, second=0, microsecond=0)
+        if self._hour_start == hour_start:
+            return
+        if self._hour_start is not None:
+            self._completed.append(
+                HourlyRuntime(
+                    self._hour_start, {category: self._current[category] for category in RUNTIME_CATEGORIES}
+                )
+            )
+        self._hour_start = hour_start
+        self._current = defaultdict(float)
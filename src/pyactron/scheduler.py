@@ -0,0 +1,101 @@
+"""Priority scheduling of the requests to a local controller."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import heapq
+import itertools
+
+from .const import RequestPriority
+from .exceptions import ActronRequestDropped
+
+# requests of this priority and below can be dropped
+DROPPABLE_PRIORITY = RequestPriority.POLL
+
+
+class RequestScheduler:
+    """Limit the concurrent requests to a device, serving the most urgent ones first.
+
+    Waiting requests are started in priority order, then in arrival order. One slot is
+    kept free of droppable requests, so an interactive request does not wait behind a
+    full set of slow polls. When too many requests are waiting, the least urgent
+    droppable one is dropped, with ActronRequestDropped.
+    """
+
+    def __init__(self, max_concurrent: int, max_waiting: int) -> None:
+        """Init the scheduler."""
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.max_concurrent_droppable = max(1, max_concurrent - 1)
+        self.dropped = 0
+        self._active = 0
+        self._active_droppable = 0
+        self._waiting: list[tuple[RequestPriority, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Wait for a slot to send a request of the given priority."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def _can_start(self, priority: RequestPriority) -> bool:
+        if self._active >= self.max_concurrent:
+            return False
+        return priority < DROPPABLE_PRIORITY or self._active_droppable < self.max_concurrent_droppable
+
+    def _start(self, priority: RequestPriority) -> None:
+        self._active += 1
+        if priority >= DROPPABLE_PRIORITY:
+            self._active_droppable += 1
+
+    def _release(self, priority: RequestPriority) -> None:
+        self._active -= 1
+        if priority >= DROPPABLE_PRIORITY:
+            self._active_droppable -= 1
+
+        # the head of the heap is the most urgent request, if it cannot start none can
+        while self._waiting and self._can_start(self._waiting[0][0]):
+            waiting_priority, _, future = heapq.heappop(self._waiting)
+            self._start(waiting_priority)
+            future.set_result(None)
+
+    def _drop(self, priority: RequestPriority) -> None:
+        """Make room in the queue for a request, or drop it."""
+        worst = max(self._waiting)
+        if priority >= DROPPABLE_PRIORITY and priority >= worst[0]:
+            self.dropped += 1
+            raise ActronRequestDropped(f"Dropped a {priority.name.lower()} request, too many requests are waiting")
+
+        if worst[0] >= DROPPABLE_PRIORITY:
+            self._waiting.remove(worst)
+            heapq.heapify(self._waiting)
+            self.dropped += 1
+            worst[2].set_exception(
+                ActronRequestDropped(f"Dropped a {worst[0].name.lower()} request, too many requests are waiting")
+            )
+        # otherwise no waiting request can be dropped, the request waits over the limit
+
+    async def _acquire(self, priority: RequestPriority) -> None:
+        if self._can_start(priority) and (not self._waiting or priority < self._waiting[0][0]):
+            self._start(priority)
+            return
+
+        if len(self._waiting) >= self.max_waiting:
+            self._drop(priority)
+
+        entry = (priority, next(self._sequence), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiting, entry)
+        try:
+            await entry[2]
+        except asyncio.CancelledError:
+            if entry[2].done() and not entry[2].cancelled() and entry[2].exception() is None:
+                # the slot was handed over just before the cancellation, pass it on
+                self._release(priority)
+            elif entry in self._waiting:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+            raise
@@ -2,39 +2,53 @@
 
 import json
 import logging
-from dataclasses import dataclass
-from typing import ClassVar
+from dataclasses import dataclass, field
 
 from aiohttp import ClientSession
-from aiohttp.client_exceptions import (
-    ClientOSError,
-    ClientResponseError,
-    ServerDisconnectedError,
-)
 
-from .exceptions import ActronException
+from .client_metrics import Operation
+from .cloud_client import CloudClient
+from .exceptions import ActronException, ActronResponseError
 
 _LOGGER = logging.getLogger(__name__)
 
+SERVICE_CONFIGURATION_URL = "https://que.actronair.com.au/api/v0/bc/app-config"
+
 @dataclass
 class ServiceConfiguration:
     """Actron service configuration class for cloud service."""
-    # Class variables (not serialized)
-    service_configuration_url: ClassVar[str] = "https://que.actronair.com.au/api/v0/bc/app-config"
-    
     # Non-serializable fields (must be first to be required)
     session: ClientSession
-    
+
+    # Where the rest of the configuration is retrieved from, a simulator can stand in for the cloud
+    service_configuration_url: str = SERVICE_CONFIGURATION_URL
+
     # Instance variables (serialized)
     service_base_url: str = "https://que.actronair.com.au/api/v0/bc"
     ninja_service_host: str = "que.actronair.com.au"
     notification_mode: str = "SignalR"
     signalr_endpoint: str = "https://que.actronair.com.au/api/v0/messaging/aconnect"
 
+    # Client for all the cloud requests (not serialized)
+    cloud: CloudClient = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Initialize after dataclass creation."""
+        self.cloud = CloudClient(self.session)
+
+    @property
+    def ninja_service_url(self) -> str:
+        """Return the base URL of the Ninja service."""
+        # the cloud only ever returns a host name, a scheme is only present for local stand-ins
+        if "://" in self.ninja_service_host:
+            return self.ninja_service_host
+        return f"https://{self.ninja_service_host}"
+
     def to_dict(self) -> dict:
         """Convert to serializable dictionary."""
         # Manually create dict excluding the session field to avoid deepcopy issues
         return {
+            "service_configuration_url": self.service_configuration_url,
             "service_base_url": self.service_base_url,
             "ninja_service_host": self.ninja_service_host,
             "notification_mode": self.notification_mode,
@@ -58,52 +72,25 @@ class ServiceConfiguration:
         )
 
         try:
-            async with self.session.get(
-                f"{self.service_configuration_url}",
-            ) as response:
-                if response.status != 200:
-                    _LOGGER.debug(
-                        "Unexpected HTTP status code %s for %s",
-                        response.status,
-                        response.url,
-                    )
-                response.raise_for_status()
-
-                data = json.loads(await response.text())
-
-                self.service_base_url = data["accountServiceBaseUri"]
-                self.ninja_service_host = data["ninjaServiceHost"]
-                self.notification_mode = data["notificationMode"]
-                self.signalr_endpoint = data["signalrEndpoint"]
-
-        # TODO: do this to other HTTP requests
-        except ClientOSError as e:
-            _LOGGER.error("Network error while fetching service configuration: %s", e)
-            raise ActronException(f"Network error: {e}") from e
-        except ClientResponseError as e:
-            _LOGGER.error(
-                "HTTP error while fetching service configuration: %s (status: %s)",
-                e,
-                e.status,
-            )
-            raise ActronException(f"HTTP error {e.status}: {e}") from e
-        except ServerDisconnectedError as e:
-            _LOGGER.error(
-                "Server disconnected while fetching service configuration: %s", e
-            )
-            raise ActronException(f"Server disconnected: {e}") from e
+            response = await self.cloud.get(self.service_configuration_url, Operation.GET_SERVICE_CONFIGURATION)
+        except ActronException as e:
+            _LOGGER.error("Error while fetching service configuration: %s", e)
+            raise
+
+        try:
+            data = json.loads(response)
+
+            self.service_base_url = data["accountServiceBaseUri"]
+            self.ninja_service_host = data["ninjaServiceHost"]
+            self.notification_mode = data["notificationMode"]
+            self.signalr_endpoint = data["signalrEndpoint"]
         except json.JSONDecodeError as e:
             _LOGGER.error(
                 "Invalid JSON response from service configuration endpoint: %s", e
             )
-            raise ActronException(f"Invalid JSON response: {e}") from e
+            raise ActronResponseError(f"Invalid JSON response: {e}") from e
         except KeyError as e:
             _LOGGER.error(
                 "Missing required field in service configuration response: %s", e
             )
-            raise ActronException(f"Missing required field in response: {e}") from e
-        except Exception as e:
-            _LOGGER.error(
-                "Unexpected error while fetching service configuration: %s", e
-            )
-            raise ActronException(f"Unexpected error: {e}") from e
+            raise ActronResponseError(f"Missing required field in response: {e}") from e
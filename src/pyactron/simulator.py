@@ -0,0 +1,451 @@
+"""Local stand-ins for Actron controllers and the Actron cloud services.
+
+A single aiohttp server hosts any number of simulated controllers, each one under
+its own path prefix, along with the cloud endpoints used by pyactron: app-config,
+signin, the device list and Ninja commands. The controller for unit ``n`` is
+reachable with the host ``127.0.0.1:<port>/unit/<n>``, the Ninja service with the
+host ``http://127.0.0.1:<port>`` and the service configuration at app_config_url.
+
+Commands reach the units after a configurable propagation delay, as with the real
+cloud. A thermal model can move the room temperature according to the mode, the
+set point and the compressor: it advances in fixed steps, so the same commands
+always give the same temperatures. Run a fleet from the integration folder::
+
+    python -m pyactron.simulator --units 2 --port 8080 --propagation-delay 5 --thermal-step 1
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+import json
+import logging
+import threading
+
+from aiohttp import BasicAuth, web
+
+from .actron_user import ActronUser
+
+_LOGGER = logging.getLogger(__name__)
+
+# maps the Ninja "DA" keys to the fields reported by the local controller
+NINJA_TO_STATUS_FIELD = {
+    "amOn": "isOn",
+    "mode": "mode",
+    "fanSpeed": "fanSpeed",
+    "tempTarget": "setPoint",
+    "enabledZones": "enabledZones",
+}
+
+
+# values of compressorActivity and mode, as sent by the controller
+COMPRESSOR_HEATING = 0
+COMPRESSOR_COOLING = 1
+COMPRESSOR_IDLE = 2
+MODE_AUTO = 0
+MODE_HEAT = 1
+MODE_COOL = 2
+
+
+@dataclass
+class ThermalModel:
+    """Simple thermal model of a room."""
+
+    outdoor_temperature: float = 30.0
+    # share of the difference with the outdoor temperature lost per minute
+    leakage_per_minute: float = 0.01
+    # degrees per minute the compressor moves the room temperature by
+    capacity_per_minute: float = 0.3
+    # degrees past the set point before the compressor starts again
+    hysteresis: float = 0.5
+
+
+@dataclass
+class SimulatedUnit:
+    """State of one simulated Actron unit."""
+
+    index: int
+    zone_count: int = 4
+    firmware_version: str = "1.0.0"
+    password: str = "password"
+    status: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Initialize the default status."""
+        if not self.status:
+            self.status = {
+                "isOn": False,
+                "mode": 2,
+                "fanSpeed": 0,
+                "setPoint": 22.0,
+                "roomTemp_oC": 24.0,
+                "isInESP_Mode": False,
+                "fanIsCont": 0,
+                "compressorActivity": 2,
+                "enabledZones": [1] * self.zone_count,
+            }
+        # the status only reports the room temperature to a tenth of a degree
+        self.temperature = float(self.status["roomTemp_oC"])
+
+    @property
+    def mac(self) -> str:
+        """Return the unit's MAC address."""
+        return f"{self.index:012X}"
+
+    @property
+    def device_id(self) -> str:
+        """Return the unit's block id, as reported by the local controller."""
+        return f"ACONNECT{self.mac}"
+
+    @property
+    def block_id(self) -> str:
+        """Return the unit's block id, as reported by the Ninja service."""
+        return f"{self.device_id}_0_0_1"
+
+    @property
+    def email(self) -> str:
+        """Return the email of the user owning the unit."""
+        return f"unit{self.index}@example.com"
+
+    @property
+    def user_access_token(self) -> str:
+        """Return the access token of the user owning the unit."""
+        return f"token-{self.index}"
+
+    def user(self) -> ActronUser:
+        """Return the user owning the unit, as returned by the signin endpoint."""
+        return ActronUser(
+            email=self.email,
+            fullname=f"Unit {self.index}",
+            address="",
+            suburb="",
+            postcode="",
+            state="",
+            country="",
+            user_access_token=self.user_access_token,
+            aircon_block_id=self.block_id,
+            aircon_zone_number=self.zone_count,
+            zones=[f"Zone {zone}" for zone in range(self.zone_count)],
+        )
+
+    def signin(self) -> dict:
+        """Return the content of the signin response."""
+        return {
+            "value": {
+                "email": self.email,
+                "fullname": f"Unit {self.index}",
+                "address1": "",
+                "suburb": "",
+                "postcode": "",
+                "state": "",
+                "country": "",
+                "userAccessToken": self.user_access_token,
+                "lastUpdated": "2024-01-01T00:00:00",
+                "createdAt": "2024-01-01T00:00:00",
+                "timezone": "Australia/Sydney",
+                "version": "1",
+                "airconBlockId": self.block_id,
+                "airconType": 0,
+                "airconZoneNumber": self.zone_count,
+                "zones": [f"Zone {zone}" for zone in range(self.zone_count)],
+            }
+        }
+
+    def info(self) -> dict:
+        """Return the content of 1.json."""
+        return {
+            "MacAddress": self.mac,
+            "BlockID": self.device_id,
+            "firmwareVersion": self.firmware_version,
+        }
+
+    def apply(self, values: dict) -> None:
+        """Apply the values of a Ninja command."""
+        for key, value in values.items():
+            if key in NINJA_TO_STATUS_FIELD:
+                self.status[NINJA_TO_STATUS_FIELD[key]] = bool(value) if key == "amOn" else value
+
+    def step(self, seconds: float, model: ThermalModel) -> None:
+        """Move the room temperature and the compressor forward in time."""
+        status = self.status
+        set_point = status["setPoint"]
+        activity = status["compressorActivity"]
+        if not status["isOn"] or status["mode"] not in (MODE_AUTO, MODE_HEAT, MODE_COOL):
+            activity = COMPRESSOR_IDLE
+        else:
+            can_cool = status["mode"] in (MODE_AUTO, MODE_COOL)
+            can_heat = status["mode"] in (MODE_AUTO, MODE_HEAT)
+            # the compressor runs until the set point is reached, and starts again past the hysteresis
+            if activity == COMPRESSOR_COOLING and (not can_cool or self.temperature <= set_point):
+                activity = COMPRESSOR_IDLE
+            if activity == COMPRESSOR_HEATING and (not can_heat or self.temperature >= set_point):
+                activity = COMPRESSOR_IDLE
+            if activity == COMPRESSOR_IDLE:
+                if can_cool and self.temperature >= set_point + model.hysteresis:
+                    activity = COMPRESSOR_COOLING
+                elif can_heat and self.temperature <= set_point - model.hysteresis:
+                    activity = COMPRESSOR_HEATING
+
+        minutes = seconds / 60
+        self.temperature += (model.outdoor_temperature - self.temperature) * model.leakage_per_minute * minutes
+        if activity == COMPRESSOR_COOLING:
+            self.temperature -= model.capacity_per_minute * minutes
+        elif activity == COMPRESSOR_HEATING:
+            self.temperature += model.capacity_per_minute * minutes
+
+        status["compressorActivity"] = activity
+        status["roomTemp_oC"] = round(self.temperature, 1)
+
+
+@dataclass
+class Fault:
+    """Fault injected in the responses to one kind of request."""
+
+    # seconds to wait before handling the request
+    delay: float = 0.0
+    # HTTP status to answer with instead of handling the request
+    status: int | None = None
+    # only send the first half of the body
+    truncate: bool = False
+    # close the connection without answering
+    drop: bool = False
+
+
+class SimulatedFleet:
+    """Serve any number of simulated controllers and the cloud services locally.
+
+    Commands are applied to the units propagation_delay seconds after they are
+    received. With a thermal_step, the thermal model of every unit advances by
+    thermal_step * time_scale seconds every thermal_step seconds; without one, it
+    only advances when step is called.
+    """
+
+    def __init__(
+        self,
+        unit_count: int,
+        zone_count: int = 4,
+        propagation_delay: float = 0.0,
+        thermal_model: ThermalModel | None = None,
+        thermal_step: float | None = None,
+        time_scale: float = 1.0,
+    ) -> None:
+        """Init the fleet."""
+        self.units = [SimulatedUnit(index, zone_count) for index in range(unit_count)]
+        self.units_by_block_id = {unit.block_id: unit for unit in self.units}
+        self.units_by_token = {unit.user_access_token: unit for unit in self.units}
+        self.units_by_email = {unit.email: unit for unit in self.units}
+        self.propagation_delay = propagation_delay
+        self.thermal_model = thermal_model or ThermalModel()
+        self.thermal_step = thermal_step
+        self.time_scale = time_scale
+        self.requests: Counter[str] = Counter()
+        # faults to inject, by kind of request: app_config, signin, info (1.json), status (6.json),
+        # devices or command
+        self.faults: dict[str, Fault] = {}
+        self.port: int = 0
+        self._runner: web.AppRunner | None = None
+        self._thermal_task: asyncio.Task | None = None
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.add_routes(
+            [
+                web.get("/api/v0/bc/app-config", self._handle_app_config, name="app_config"),
+                web.post("/api/v0/bc/signin", self._handle_signin, name="signin"),
+                web.get("/unit/{index}/1.json", self._handle_info, name="info"),
+                web.get("/unit/{index}/6.json", self._handle_status, name="status"),
+                web.get("/rest/v0/devices", self._handle_devices, name="devices"),
+                web.put("/rest/v0/device/{block_id}", self._handle_command, name="command"),
+            ]
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start serving."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        if self.thermal_step is not None:
+            self._thermal_task = asyncio.create_task(self._run_thermal_model(self.thermal_step))
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._thermal_task is not None:
+            self._thermal_task.cancel()
+            await asyncio.gather(self._thermal_task, return_exceptions=True)
+            self._thermal_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def controller_host(self, index: int) -> str:
+        """Return the host to use for the local controller of a unit."""
+        return f"127.0.0.1:{self.port}/unit/{index}"
+
+    @property
+    def ninja_service_host(self) -> str:
+        """Return the host to use for the Ninja service."""
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def app_config_url(self) -> str:
+        """Return the URL to use for the service configuration."""
+        return f"http://127.0.0.1:{self.port}/api/v0/bc/app-config"
+
+    def step(self, seconds: float) -> None:
+        """Advance the thermal model of every unit."""
+        for unit in self.units:
+            unit.step(seconds, self.thermal_model)
+
+    async def _run_thermal_model(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.step(interval * self.time_scale)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count requests and inject faults."""
+        kind = request.match_info.route.name
+        self.requests[kind] += 1
+
+        fault = self.faults.get(kind)
+        if fault is None:
+            return await handler(request)
+
+        if fault.delay:
+            await asyncio.sleep(fault.delay)
+        if fault.drop:
+            # the response is never written, the connection is closed before it
+            request.transport.close()
+            return web.Response()
+        if fault.status is not None:
+            return web.Response(status=fault.status)
+        response = await handler(request)
+        if fault.truncate:
+            response.text = response.text[: len(response.text) // 2]
+        return response
+
+    def _unit(self, request: web.Request) -> SimulatedUnit:
+        try:
+            return self.units[int(request.match_info["index"])]
+        except (IndexError, ValueError) as e:
+            raise web.HTTPNotFound from e
+
+    async def _handle_app_config(self, request: web.Request) -> web.Response:
+        body = {
+            "accountServiceBaseUri": f"{self.ninja_service_host}/api/v0/bc",
+            "ninjaServiceHost": self.ninja_service_host,
+            "notificationMode": "SignalR",
+            "signalrEndpoint": f"{self.ninja_service_host}/api/v0/messaging/aconnect",
+        }
+        return web.Response(text=json.dumps(body))
+
+    async def _handle_signin(self, request: web.Request) -> web.Response:
+        try:
+            auth = BasicAuth.decode(request.headers.get("Authorization", ""))
+        except ValueError as e:
+            raise web.HTTPUnauthorized from e
+        unit = self.units_by_email.get(auth.login)
+        if unit is None or auth.password != unit.password:
+            raise web.HTTPUnauthorized
+        return web.Response(text=json.dumps(unit.signin()))
+
+    async def _handle_info(self, request: web.Request) -> web.Response:
+        return web.Response(text=json.dumps(self._unit(request).info()))
+
+    async def _handle_status(self, request: web.Request) -> web.Response:
+        return web.Response(text=json.dumps(self._unit(request).status))
+
+    async def _handle_devices(self, request: web.Request) -> web.Response:
+        unit = self.units_by_token.get(request.query.get("user_access_token"))
+        if unit is None:
+            raise web.HTTPForbidden
+        body = {
+            unit.block_id: {
+                "vid": 0,
+                "did": 0,
+                "device_type": "airconditioner",
+                "default_name": "Air Conditioner Settings",
+            }
+        }
+        return web.Response(text=json.dumps(body, separators=(",", ":")))
+
+    async def _handle_command(self, request: web.Request) -> web.Response:
+        unit = self.units_by_block_id.get(request.match_info["block_id"])
+        if unit is None or request.query.get("user_access_token") != unit.user_access_token:
+            raise web.HTTPForbidden
+        try:
+            values = json.loads(await request.text())["DA"]
+        except (json.JSONDecodeError, KeyError) as e:
+            raise web.HTTPBadRequest from e
+        if self.propagation_delay:
+            # commands issued in order propagate in order
+            asyncio.get_running_loop().call_later(self.propagation_delay, unit.apply, values)
+        else:
+            unit.apply(values)
+        return web.Response(text="{}")
+
+
+class SimulatorThread:
+    """Run a simulated fleet on a dedicated thread and event loop.
+
+    Keeps the work of the simulator out of the event loop being measured.
+    """
+
+    def __init__(self, fleet: SimulatedFleet) -> None:
+        """Init the thread."""
+        self.fleet = fleet
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self) -> SimulatedFleet:
+        """Start the fleet."""
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.fleet.start(), self.loop).result()
+        return self.fleet
+
+    def __exit__(self, *exc) -> None:
+        """Stop the fleet."""
+        asyncio.run_coroutine_threadsafe(self.fleet.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+async def _serve(fleet: SimulatedFleet, port: int) -> None:
+    await fleet.start(port=port)
+    print(f"Service configuration: {fleet.app_config_url}")
+    for unit in fleet.units:
+        print(f"Unit {unit.index}: host {fleet.controller_host(unit.index)}, user {unit.email}, password {unit.password}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await fleet.stop()
+
+
+def main() -> None:
+    """Serve a simulated fleet from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=1, help="number of simulated units")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--propagation-delay", type=float, default=0.0, help="seconds before a command reaches a unit")
+    parser.add_argument("--thermal-step", type=float, help="seconds between steps of the thermal model, off by default")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="simulated seconds per real second")
+    parser.add_argument("--outdoor-temperature", type=float, default=ThermalModel.outdoor_temperature)
+    args = parser.parse_args()
+
+    fleet = SimulatedFleet(
+        args.units,
+        propagation_delay=args.propagation_delay,
+        thermal_model=ThermalModel(outdoor_temperature=args.outdoor_temperature),
+        thermal_step=args.thermal_step,
+        time_scale=args.time_scale,
+    )
+    try:
+        asyncio.run(_serve(fleet, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Snapshots of the state of an Actron device."""
+
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+
+from .const import HVACAction, HVACMode
+
+
+@dataclass(frozen=True)
+class ApplianceState:
+    """Immutable snapshot of the state of a device."""
+
+    is_on: bool
+    mode: HVACMode
+    fan_speed: str
+    target_temperature: float
+    current_temperature: float
+    compressor_activity: HVACAction
+    is_esp_on: bool
+    is_fan_continuous: bool
+    enabled_zones: tuple[int, ...]
+
+    def diff(self, other: "ApplianceState | None") -> frozenset[str]:
+        """Return the names of the fields that differ from another snapshot."""
+        if other is None:
+            return frozenset(item.name for item in fields(self))
+        return frozenset(
+            item.name for item in fields(self) if getattr(self, item.name) != getattr(other, item.name)
+        )
+
+    def to_dict(self) -> dict:
+        """Convert to serializable dictionary."""
+        return {
+            item.name: list(value) if isinstance(value := getattr(self, item.name), tuple) else value
+            for item in fields(self)
+        }
+
+
+@dataclass(frozen=True)
+class StateDelta:
+    """Change in the state of a device."""
+
+    state: ApplianceState
+    previous: ApplianceState | None
+    changed: frozenset[str]
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    @property
+    def changes(self) -> dict:
+        """Return the new value of each changed field."""
+        return {
+            item.name: getattr(self.state, item.name) for item in fields(self.state) if item.name in self.changed
+        }
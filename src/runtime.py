@@ -0,0 +1,96 @@
+"""Long-term runtime statistics for Actron devices."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, RUNTIME_MAX_SAMPLE_GAP_SECONDS
+from .pyactron.appliance import Appliance
+from .pyactron.runtime import RUNTIME_CATEGORIES, HourlyRuntime, RuntimeAccumulator
+
+_LOGGER = logging.getLogger(__name__)
+
+CATEGORY_NAMES = {
+    "heating": "Compressor heating time",
+    "cooling": "Compressor cooling time",
+    "idle": "Compressor idle time",
+    "on_heat_cool": "Auto mode time",
+    "on_heat": "Heat mode time",
+    "on_cool": "Cool mode time",
+    "on_fan_only": "Fan only mode time",
+}
+
+
+class ActronRuntimeStatistics:
+    """Aggregate the runtime of a device and import it into long-term statistics.
+
+    Polls only update the in-memory totals of the current hour, the recorder gets one
+    batched import per statistic when an hour is complete.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, device: Appliance) -> None:
+        """Initialize the runtime statistics."""
+        self.hass = hass
+        self.entry = entry
+        self.device = device
+        self.accumulator = RuntimeAccumulator(timedelta(seconds=RUNTIME_MAX_SAMPLE_GAP_SECONDS))
+        self._sums: dict[str, float] = {}
+
+    def statistic_id(self, category: str) -> str:
+        """Return the id of the statistic of a runtime category."""
+        return f"{DOMAIN}:{self.device.device_id.lower()}_{category}_time"
+
+    @callback
+    def async_add_sample(self) -> None:
+        """Add a sample of the current device state."""
+        self.accumulator.add_sample(
+            dt_util.utcnow(), self.device.is_on, self.device.mode, self.device.compressor_activity
+        )
+        if hours := self.accumulator.pop_completed():
+            self.entry.async_create_background_task(
+                self.hass, self._async_import(hours), f"{DOMAIN} import runtime statistics"
+            )
+
+    async def _async_import(self, hours: list[HourlyRuntime]) -> None:
+        """Import completed hours into long-term statistics."""
+        for category in RUNTIME_CATEGORIES:
+            statistic_id = self.statistic_id(category)
+            if statistic_id not in self._sums:
+                self._sums[statistic_id] = await self._async_get_last_sum(statistic_id)
+
+            statistics: list[StatisticData] = []
+            for hour in hours:
+                value = hour.seconds[category] / 3600
+                self._sums[statistic_id] += value
+                statistics.append(StatisticData(start=hour.start, state=value, sum=self._sums[statistic_id]))
+
+            metadata = StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{self.device.device_id} {CATEGORY_NAMES[category]}",
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=UnitOfTime.HOURS,
+            )
+            async_add_external_statistics(self.hass, metadata, statistics)
+
+    async def _async_get_last_sum(self, statistic_id: str) -> float:
+        """Return the last imported sum of a statistic, to continue it after a restart."""
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+        )
+        if not last.get(statistic_id):
+            return 0.0
+        return last[statistic_id][0]["sum"] or 0.0
@@ -15,7 +15,11 @@ from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from .const import ATTR_INSIDE_TEMPERATURE
+from .const import (
+    ATTR_INSIDE_TEMPERATURE,
+    INSIDE_TEMPERATURE_DEADBAND,
+    INSIDE_TEMPERATURE_MIN_INTERVAL_SECONDS,
+)
 from .coordinator import ActronConfigEntry, ActronCoordinator
 from .entity import ActronEntity
 from .pyactron.appliance import Appliance
@@ -25,6 +29,9 @@ class ActronSensorEntityDescription(SensorEntityDescription):
     """Describes Actron sensor entity."""
 
     value_func: Callable[[Appliance], float | None]
+    # limits on how often a changing value is written, see ActronEntity
+    deadband: float = 0.0
+    min_interval: float = 0.0
 
 SENSOR_TYPES: tuple[ActronSensorEntityDescription, ...] = (
     ActronSensorEntityDescription(
@@ -34,6 +41,8 @@ SENSOR_TYPES: tuple[ActronSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_func=lambda device: device.current_temperature,
+        deadband=INSIDE_TEMPERATURE_DEADBAND,
+        min_interval=INSIDE_TEMPERATURE_MIN_INTERVAL_SECONDS,
     ),
 )
 
@@ -66,8 +75,14 @@ class ActronSensor(ActronEntity, SensorEntity):
         super().__init__(coordinator)
         self.entity_description = description
         self._attr_unique_id = f"{self.device.device_id}-{description.key}"
+        self._state_deadband = description.deadband
+        self._state_min_interval = description.min_interval
 
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
         return self.entity_description.value_func(self.device)
+
+    def _rate_limited_value(self) -> tuple[float | None, None]:
+        """Return the value to rate limit."""
+        return self.native_value, None
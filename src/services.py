@@ -0,0 +1,155 @@
+"""Services for the actron_connect integration."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict
+import json
+import logging
+
+import voluptuous as vol
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .const import DEVICE_MAX_TEMP, DEVICE_MIN_TEMP, DOMAIN
+from .coordinator import ActronConfigEntry, ActronCoordinator
+from .entity import ActronEntity
+from .pyactron.appliance import FAN_SPEED_STRING_TO_ACTRON, Appliance
+from .pyactron.group import send_to_group
+from .pyactron.profiling import (
+    DEFAULT_SLOW_THRESHOLD_MS,
+    PYACTRON_TARGETS,
+    Profiler,
+    ProfileTarget,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+SERVICE_SET_GROUP = "set_group"
+ATTR_HVAC_MODE = "hvac_mode"
+ATTR_FAN_MODE = "fan_mode"
+ATTR_ENABLED = "enabled"
+ATTR_SLOW_THRESHOLD = "slow_threshold"
+ATTR_FILENAME = "filename"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENABLED): cv.boolean,
+        vol.Optional(ATTR_SLOW_THRESHOLD, default=DEFAULT_SLOW_THRESHOLD_MS): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        # the profile is written in the configuration directory
+        vol.Optional(ATTR_FILENAME): vol.Match(r"^[\w.-]+$"),
+    }
+)
+
+SET_GROUP_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            # all the devices when omitted or empty
+            vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_HVAC_MODE): vol.Coerce(HVACMode),
+            vol.Optional(ATTR_TEMPERATURE): vol.All(
+                vol.Coerce(float), vol.Range(min=DEVICE_MIN_TEMP, max=DEVICE_MAX_TEMP)
+            ),
+            vol.Optional(ATTR_FAN_MODE): vol.In(list(FAN_SPEED_STRING_TO_ACTRON)),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_HVAC_MODE, ATTR_TEMPERATURE, ATTR_FAN_MODE),
+)
+
+PROFILE_TARGETS = (
+    *PYACTRON_TARGETS,
+    ProfileTarget(ActronEntity, "async_write_ha_state", "entity.write_state"),
+)
+
+
+def _write_profile(path: str, profile: dict) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(profile, file, indent=2)
+
+
+def _group_coordinators(hass: HomeAssistant, entity_ids: list[str] | None) -> list[ActronCoordinator]:
+    """Return the coordinators of the devices of the entities, or of all the devices."""
+    entries: list[ActronConfigEntry] = [
+        entry for entry in hass.config_entries.async_entries(DOMAIN) if entry.state is ConfigEntryState.LOADED
+    ]
+    if entity_ids:
+        registry = er.async_get(hass)
+        entry_ids = set()
+        for entity_id in entity_ids:
+            if (entity := registry.async_get(entity_id)) is None or entity.platform != DOMAIN:
+                raise HomeAssistantError(f"{entity_id} is not an Actron entity")
+            entry_ids.add(entity.config_entry_id)
+        entries = [entry for entry in entries if entry.entry_id in entry_ids]
+    return [entry.runtime_data for entry in entries]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    profiler = Profiler()
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Turn profiling on or off, writing the profile to a file when turned off."""
+        if call.data[ATTR_ENABLED]:
+            profiler.reset()
+            profiler.enable(PROFILE_TARGETS, call.data[ATTR_SLOW_THRESHOLD])
+            _LOGGER.info("Profiling enabled")
+            return
+
+        profile = profiler.report()
+        profiler.disable()
+        _LOGGER.info("Profiling disabled: %s", profile)
+        if filename := call.data.get(ATTR_FILENAME):
+            await hass.async_add_executor_job(_write_profile, hass.config.path(filename), profile)
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA)
+
+    async def async_set_group(call: ServiceCall) -> ServiceResponse:
+        """Set the mode, target temperature or fan speed of many devices at once."""
+        coordinators = {
+            coordinator.device: coordinator for coordinator in _group_coordinators(hass, call.data.get(ATTR_ENTITY_ID))
+        }
+
+        # separate steps, so a retry does not send the ones that went through again
+        steps: list[Callable[[Appliance], Awaitable[None]]] = []
+        if ATTR_HVAC_MODE in call.data:
+            steps.append(lambda device: device.async_set_hvac_mode(call.data[ATTR_HVAC_MODE]))
+        if ATTR_TEMPERATURE in call.data:
+            steps.append(lambda device: device.async_set_temperature(call.data[ATTR_TEMPERATURE]))
+        if ATTR_FAN_MODE in call.data:
+            steps.append(lambda device: device.async_set_fan_mode(call.data[ATTR_FAN_MODE]))
+
+        results = await send_to_group(coordinators, steps)
+
+        # entities pick up the optimistic state, and the coordinators confirm it
+        for coordinator in coordinators.values():
+            coordinator.async_update_listeners()
+        for coordinator in coordinators.values():
+            await coordinator.async_request_refresh()
+
+        failed = [result.device_id for result in results if not result.success and not result.queued]
+        queued = [result.device_id for result in results if result.queued]
+        if (failed or queued) and not call.return_response:
+            errors = []
+            if failed:
+                errors.append(f"Failed to update {', '.join(failed)}")
+            if queued:
+                errors.append(f"Commands kept until the Ninja service is reachable for {', '.join(queued)}")
+            raise HomeAssistantError("; ".join(errors))
+        return {"units": [asdict(result) for result in results]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_GROUP,
+        async_set_group,
+        schema=SET_GROUP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -51,17 +51,19 @@ class ActronZoneSwitch(ActronEntity, SwitchEntity):
     @property
     def is_on(self) -> bool:
         """Return the state of the sensor."""
-        return self.device.enabled_zones[self._zone_id] == 1
+        return self.device.is_zone_enabled(self._zone_id)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the zone on."""
         await self.device.async_zone_turn_on(self._zone_id)
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the zone off."""
         await self.device.async_zone_turn_off(self._zone_id)
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
 
 
 class ActronToggleSwitch(ActronEntity, SwitchEntity):
@@ -83,9 +85,11 @@ class ActronToggleSwitch(ActronEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the AC on."""
         await self.device.async_turn_on()
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the AC off."""
         await self.device.async_turn_off()
-        await self.coordinator.async_refresh()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
@@ -0,0 +1,6 @@
+"""Make pyactron importable the way the integration's own tools import it."""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -0,0 +1,55 @@
+"""Simulated units shared by the tests."""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import importlib.util
+from pathlib import Path
+import sys
+
+from aiohttp import ClientSession
+
+from pyactron.appliance import Appliance
+from pyactron.command_journal import CommandJournal
+from pyactron.service_configuration import ServiceConfiguration
+from pyactron.simulator import SimulatedFleet
+
+
+def load_integration() -> None:
+    """Import the integration as the actron_connect package, as Home Assistant does."""
+    if "actron_connect" in sys.modules:
+        return
+    src = Path(__file__).parent.parent / "src"
+    spec = importlib.util.spec_from_file_location(
+        "actron_connect", src / "__init__.py", submodule_search_locations=[str(src)]
+    )
+    sys.modules["actron_connect"] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sys.modules["actron_connect"])
+
+
+@asynccontextmanager
+async def simulated_fleet(unit_count: int = 1, **fleet_options) -> AsyncIterator[tuple[SimulatedFleet, ClientSession]]:
+    """Yield a running fleet and a session to reach it."""
+    fleet = SimulatedFleet(unit_count, **fleet_options)
+    await fleet.start()
+    try:
+        async with ClientSession() as session:
+            yield fleet, session
+    finally:
+        await fleet.stop()
+
+
+def create_appliance(fleet: SimulatedFleet, session: ClientSession, index: int = 0) -> Appliance:
+    """Return an appliance with a journal for a unit of the fleet, not initialized yet."""
+    service_configuration = ServiceConfiguration(session, ninja_service_host=fleet.ninja_service_host)
+    return Appliance(
+        fleet.controller_host(index), service_configuration, fleet.units[index].user(), session, CommandJournal()
+    )
+
+
+@asynccontextmanager
+async def simulated_appliance(**fleet_options) -> AsyncIterator[tuple[Appliance, SimulatedFleet]]:
+    """Yield an initialized appliance with a journal, and the fleet it runs on."""
+    async with simulated_fleet(1, **fleet_options) as (fleet, session):
+        device = create_appliance(fleet, session)
+        await device.init()
+        yield device, fleet
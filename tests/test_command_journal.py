@@ -0,0 +1,79 @@
+"""Tests for the command journal and its replay, against the simulator."""
+
+import asyncio
+import time
+
+import pytest
+
+from pyactron.command_journal import CommandJournal
+from pyactron.exceptions import ActronException
+from pyactron.simulator import Fault
+
+from simulation import simulated_appliance
+
+
+def test_later_values_replace_earlier_ones():
+    journal = CommandJournal()
+    journal.record({"tempTarget": 20.0, "fanSpeed": 1})
+    journal.record({"tempTarget": 21.0})
+
+    assert journal.pending() == {"fanSpeed": 1, "tempTarget": 21.0}
+
+
+def test_discard_keeps_values_replaced_since():
+    journal = CommandJournal()
+    journal.record({"tempTarget": 20.0, "fanSpeed": 1})
+    sent = journal.pending()
+    journal.record({"tempTarget": 21.0})
+    journal.discard(sent)
+
+    assert journal.pending() == {"tempTarget": 21.0}
+
+
+def test_expired_values_are_dropped():
+    journal = CommandJournal(max_age=60)
+    journal.restore({"tempTarget": [20.0, time.time() - 120], "fanSpeed": [1, time.time()]})
+    changes = []
+    journal.on_change = lambda: changes.append(journal.to_dict())
+
+    assert journal.pending() == {"fanSpeed": 1}
+    assert len(changes) == 1
+
+
+def test_commands_are_journaled_and_replayed():
+    async def run():
+        async with simulated_appliance() as (device, fleet):
+            fleet.faults["command"] = Fault(status=503)
+            await device.async_set_temperature(20.0)
+            await device.async_set_temperature(21.0)
+            await device.async_set_fan_mode("high")
+            assert device.command_journal
+            assert fleet.units[0].status["setPoint"] == 22.0
+            # the state shows the commands that are waiting
+            assert device.target_temperature == 21.0
+
+            del fleet.faults["command"]
+            commands = fleet.requests["command"]
+            assert await device.replay_commands()
+            return device, fleet, fleet.requests["command"] - commands
+
+    device, fleet, replayed = asyncio.run(run())
+    assert replayed == 1
+    assert not device.command_journal
+    assert fleet.units[0].status["setPoint"] == 21.0
+    assert fleet.units[0].status["fanSpeed"] == 2
+
+
+def test_rejected_replay_is_dropped():
+    async def run():
+        async with simulated_appliance() as (device, fleet):
+            fleet.faults["command"] = Fault(status=503)
+            await device.async_set_temperature(20.0)
+            fleet.faults["command"] = Fault(status=403)
+            with pytest.raises(ActronException):
+                await device.replay_commands()
+            return device, fleet
+
+    device, fleet = asyncio.run(run())
+    assert not device.command_journal
+    assert fleet.units[0].status["setPoint"] == 22.0
@@ -0,0 +1,127 @@
+"""Tests for the discovery of controllers, against the simulator."""
+
+import asyncio
+import ipaddress
+
+from aiohttp import ClientSession, web
+
+from pyactron.discovery import ControllerScanner, block_id_matches
+from pyactron.simulator import Fault, SimulatedFleet
+
+from simulation import simulated_fleet
+
+
+class NetworkScanner(ControllerScanner):
+    """Scanner probing the simulated unit at the address of the network with the same index."""
+
+    def __init__(self, session: ClientSession, fleet: SimulatedFleet, network: str, **kwargs) -> None:
+        super().__init__(session, **kwargs)
+        self.fleet = fleet
+        self.network = ipaddress.ip_network(network)
+
+    async def _probe(self, host: str):
+        # addresses without a unit get a 404 from the simulator
+        index = int(ipaddress.ip_address(host)) - int(self.network.network_address)
+        return await super()._probe(self.fleet.controller_host(index))
+
+
+def test_block_id_matches():
+    assert block_id_matches("ACONNECT000000000001", "ACONNECT000000000001")
+    assert block_id_matches("ACONNECT000000000001", "ACONNECT000000000001_0_0_1")
+    assert not block_id_matches("ACONNECT000000000001", "ACONNECT0000000000010_0_0_1")
+    assert not block_id_matches("ACONNECT000000000001", "ACONNECT000000000002_0_0_1")
+
+
+def test_network_scan_is_bounded():
+    in_flight = 0
+    max_in_flight = 0
+
+    @web.middleware
+    async def count_in_flight(request, handler):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            return await handler(request)
+        finally:
+            in_flight -= 1
+
+    async def run():
+        fleet = SimulatedFleet(3)
+        fleet.app.middlewares.insert(0, count_in_flight)
+        fleet.faults["info"] = Fault(delay=0.02)
+        await fleet.start()
+        try:
+            async with ClientSession() as session:
+                scanner = NetworkScanner(session, fleet, "10.0.0.0/24", max_concurrent_probes=16)
+                found = await scanner.scan_network("10.0.0.77/24")
+                return fleet, scanner, found
+        finally:
+            await fleet.stop()
+
+    fleet, scanner, found = asyncio.run(run())
+    # every host of the /24, without the network and broadcast addresses
+    assert fleet.requests["info"] == 254
+    assert max_in_flight == 16
+    # unit 0 is at the network address, which is not probed
+    assert sorted(controller.device_id for controller in found) == [unit.device_id for unit in fleet.units[1:]]
+    assert scanner.find(fleet.units[2].block_id) == next(
+        controller for controller in found if controller.device_id == fleet.units[2].device_id
+    )
+
+
+def test_locate_probes_the_cached_controller_again():
+    async def run():
+        async with simulated_fleet(2) as (fleet, session):
+            scanner = ControllerScanner(session)
+            await scanner.scan_hosts([fleet.controller_host(0), fleet.controller_host(1)])
+            probes = fleet.requests["info"]
+            controller = await scanner.locate(fleet.units[1].block_id)
+            return fleet, controller, fleet.requests["info"] - probes
+
+    fleet, controller, probes = asyncio.run(run())
+    assert probes == 1
+    assert controller.device_id == fleet.units[1].device_id
+    assert controller.host == fleet.controller_host(1)
+
+
+def test_locate_forgets_a_controller_that_no_longer_answers():
+    async def run():
+        async with simulated_fleet(1) as (fleet, session):
+            scanner = ControllerScanner(session)
+            await scanner.probe(fleet.controller_host(0))
+            fleet.faults["info"] = Fault(status=404)
+            controller = await scanner.locate(fleet.units[0].block_id)
+            return controller, scanner
+
+    controller, scanner = asyncio.run(run())
+    assert controller is None
+    assert scanner.controllers == []
+
+
+def test_locate_forgets_a_controller_replaced_at_its_address():
+    async def run():
+        async with simulated_fleet(2) as (fleet, session):
+            scanner = ControllerScanner(session)
+            await scanner.probe(fleet.controller_host(0))
+            # another controller took the address
+            fleet.units.reverse()
+            controller = await scanner.locate(fleet.units[1].block_id)
+            return fleet, controller, scanner
+
+    fleet, controller, scanner = asyncio.run(run())
+    assert controller is None
+    assert [cached.device_id for cached in scanner.controllers] == [fleet.units[0].device_id]
+
+
+def test_failed_probe_forgets_the_controllers_at_the_address():
+    async def run():
+        async with simulated_fleet(2) as (fleet, session):
+            scanner = ControllerScanner(session)
+            await scanner.scan_hosts([fleet.controller_host(0), fleet.controller_host(1)])
+            fleet.faults["info"] = Fault(drop=True)
+            await scanner.probe(fleet.controller_host(0))
+            return fleet, scanner
+
+    fleet, scanner = asyncio.run(run())
+    assert [cached.device_id for cached in scanner.controllers] == [fleet.units[1].device_id]
@@ -0,0 +1,115 @@
+"""Tests for group commands, against the simulator."""
+
+import asyncio
+
+from pyactron.group import send_to_group
+from pyactron.simulator import Fault
+
+from simulation import create_appliance, simulated_fleet
+
+
+def test_group_command_reaches_every_unit():
+    async def run():
+        async with simulated_fleet(3) as (fleet, session):
+            devices = [create_appliance(fleet, session, index) for index in range(3)]
+            await asyncio.gather(*(device.init() for device in devices))
+            results = await send_to_group(
+                devices,
+                [lambda device: device.async_set_temperature(20.0), lambda device: device.async_set_fan_mode("high")],
+            )
+            return fleet, results
+
+    fleet, results = asyncio.run(run())
+    assert all(result.success and result.attempts == 1 for result in results)
+    assert [unit.status["setPoint"] for unit in fleet.units] == [20.0, 20.0, 20.0]
+    assert [unit.status["fanSpeed"] for unit in fleet.units] == [2, 2, 2]
+
+
+def test_retry_resumes_from_the_failed_step():
+    async def run():
+        async with simulated_fleet(1) as (fleet, session):
+            device = create_appliance(fleet, session)
+            await device.init()
+
+            async def set_temperature(device):
+                await device.async_set_temperature(20.0)
+                # the next command is rejected once
+                fleet.faults["command"] = Fault(status=403)
+
+            async def set_fan_mode(device):
+                try:
+                    await device.async_set_fan_mode("high")
+                finally:
+                    fleet.faults.pop("command", None)
+
+            commands = fleet.requests["command"]
+            results = await send_to_group([device], [set_temperature, set_fan_mode], retry_delay=0)
+            return fleet, results, fleet.requests["command"] - commands
+
+    fleet, results, commands = asyncio.run(run())
+    assert results[0].success
+    assert results[0].attempts == 2
+    # the temperature was not sent again
+    assert commands == 3
+    assert fleet.units[0].status["fanSpeed"] == 2
+
+
+def test_queued_command_is_not_a_success():
+    async def run():
+        async with simulated_fleet(1) as (fleet, session):
+            device = create_appliance(fleet, session)
+            await device.init()
+            fleet.faults["command"] = Fault(status=503)
+            results = await send_to_group(
+                [device], [lambda device: device.async_set_temperature(20.0)], attempts=2, retry_delay=0
+            )
+            return device, results
+
+    device, results = asyncio.run(run())
+    assert not results[0].success
+    assert results[0].queued
+    assert results[0].attempts == 2
+    assert device.command_journal.pending() == {"tempTarget": 20.0}
+
+
+def test_queued_command_replayed_on_retry():
+    async def run():
+        async with simulated_fleet(1) as (fleet, session):
+            device = create_appliance(fleet, session)
+            await device.init()
+
+            async def set_temperature(device):
+                fleet.faults["command"] = Fault(status=503)
+                await device.async_set_temperature(20.0)
+                del fleet.faults["command"]
+
+            results = await send_to_group([device], [set_temperature], retry_delay=0)
+            return fleet, results
+
+    fleet, results = asyncio.run(run())
+    assert results[0].success
+    assert not results[0].queued
+    assert fleet.units[0].status["setPoint"] == 20.0
+
+
+def test_rejected_replay_fails_without_retry():
+    async def run():
+        async with simulated_fleet(1) as (fleet, session):
+            device = create_appliance(fleet, session)
+            await device.init()
+
+            async def set_temperature(device):
+                fleet.faults["command"] = Fault(status=503)
+                await device.async_set_temperature(20.0)
+                # the service is back, and rejects the queued command
+                fleet.faults["command"] = Fault(status=403)
+
+            results = await send_to_group([device], [set_temperature], attempts=3, retry_delay=0)
+            return fleet, results
+
+    fleet, results = asyncio.run(run())
+    assert not results[0].success
+    assert not results[0].queued
+    assert results[0].error
+    assert results[0].attempts == 2
+    assert fleet.units[0].status["setPoint"] == 22.0
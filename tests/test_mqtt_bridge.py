@@ -0,0 +1,135 @@
+"""Tests for the MQTT bridge, against the simulator."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientSession  # noqa: E402
+
+from simulation import load_integration  # noqa: E402
+
+load_integration()
+
+from actron_connect import mqtt_bridge  # noqa: E402
+from actron_connect.pyactron.appliance import Appliance  # noqa: E402
+from actron_connect.pyactron.service_configuration import ServiceConfiguration  # noqa: E402
+from actron_connect.pyactron.simulator import SimulatedFleet  # noqa: E402
+
+PREFIX = "actron_connect"
+
+
+@asynccontextmanager
+async def simulated_bridge(monkeypatch):
+    """Yield a bridge for a simulated device, the fleet and the published messages."""
+    published: list[tuple[str, str, bool]] = []
+
+    async def async_publish(hass, topic, payload, qos=0, retain=False):
+        published.append((topic, payload, retain))
+
+    monkeypatch.setattr(mqtt_bridge.mqtt, "async_publish", async_publish)
+
+    fleet = SimulatedFleet(1, zone_count=2)
+    await fleet.start()
+    try:
+        async with ClientSession() as session:
+            service_configuration = ServiceConfiguration(session, ninja_service_host=fleet.ninja_service_host)
+            device = Appliance(fleet.controller_host(0), service_configuration, fleet.units[0].user(), session)
+            await device.init()
+            coordinator = SimpleNamespace(
+                device=device, async_update_listeners=Mock(), async_request_refresh=AsyncMock()
+            )
+            bridge = mqtt_bridge.ActronMqttBridge(None, SimpleNamespace(runtime_data=coordinator), PREFIX)
+            publisher = asyncio.create_task(bridge._async_publish_changes())
+            try:
+                await _settle()
+                yield bridge, fleet, published
+            finally:
+                publisher.cancel()
+                await asyncio.gather(publisher, return_exceptions=True)
+    finally:
+        await fleet.stop()
+
+
+async def _settle() -> None:
+    """Let the bridge publish the pending state changes."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_publishes_changed_fields_retained(monkeypatch):
+    async def run():
+        async with simulated_bridge(monkeypatch) as (bridge, fleet, published):
+            initial = list(published)
+            published.clear()
+            await bridge.device.async_set_temperature(20.5)
+            await _settle()
+            return bridge, initial, list(published)
+
+    bridge, initial, published = asyncio.run(run())
+    base = bridge.base_topic
+    # the whole state once, then only what changed
+    assert {topic for topic, _, _ in initial} == {
+        f"{base}/{name}"
+        for name in (
+            "is_on",
+            "mode",
+            "fan_speed",
+            "target_temperature",
+            "current_temperature",
+            "compressor_activity",
+            "is_esp_on",
+            "is_fan_continuous",
+            "enabled_zones",
+        )
+    }
+    assert (f"{base}/enabled_zones", "[1, 1]", True) in initial
+    assert published == [(f"{base}/target_temperature", "20.5", True)]
+
+
+@pytest.mark.parametrize(
+    ("topic", "payload", "field", "value"),
+    [
+        ("is_on/set", "ON", "isOn", True),
+        ("mode/set", "heat", "mode", 1),
+        ("fan_speed/set", "high", "fanSpeed", 2),
+        ("target_temperature/set", "19.5", "setPoint", 19.5),
+        ("zone/1/set", "off", "enabledZones", [1, 0]),
+    ],
+)
+def test_set_topics_send_commands(monkeypatch, topic, payload, field, value):
+    async def run():
+        async with simulated_bridge(monkeypatch) as (bridge, fleet, published):
+            await bridge._async_handle_command(f"{bridge.base_topic}/{topic}", payload)
+            return bridge, fleet
+
+    bridge, fleet = asyncio.run(run())
+    assert fleet.units[0].status[field] == value
+    bridge.coordinator.async_request_refresh.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    ("topic", "payload"),
+    [
+        ("is_on/set", "maybe"),
+        ("mode/set", "warm"),
+        ("fan_speed/set", "turbo"),
+        ("target_temperature/set", "warm"),
+        ("zone/2/set", "on"),
+        ("zone/x/set", "on"),
+        ("current_temperature/set", "20"),
+    ],
+)
+def test_invalid_commands_are_ignored(monkeypatch, topic, payload):
+    async def run():
+        async with simulated_bridge(monkeypatch) as (bridge, fleet, published):
+            await bridge._async_handle_command(f"{bridge.base_topic}/{topic}", payload)
+            return bridge, fleet
+
+    bridge, fleet = asyncio.run(run())
+    assert fleet.requests["command"] == 0
+    bridge.coordinator.async_request_refresh.assert_not_called()
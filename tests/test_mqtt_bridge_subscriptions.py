@@ -0,0 +1,124 @@
+"""Tests for the MQTT bridge through Home Assistant's MQTT, against the simulator."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from aiohttp import ClientSession  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient  # noqa: E402
+
+from simulation import load_integration  # noqa: E402
+
+load_integration()
+
+from actron_connect.const import DOMAIN  # noqa: E402
+from actron_connect.mqtt_bridge import ActronMqttBridge  # noqa: E402
+from actron_connect.pyactron.appliance import Appliance  # noqa: E402
+from actron_connect.pyactron.service_configuration import ServiceConfiguration  # noqa: E402
+from actron_connect.pyactron.simulator import SimulatedFleet  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+PREFIX = "actron_connect"
+
+
+@pytest.fixture
+async def fleet():
+    """Run a simulated unit with two zones."""
+    fleet = SimulatedFleet(1, zone_count=2)
+    await fleet.start()
+    yield fleet
+    await fleet.stop()
+
+
+@pytest.fixture
+async def bridge(hass: HomeAssistant, mqtt_mock: MqttMockHAClient, fleet: SimulatedFleet):
+    """Start a bridge for the simulated unit on Home Assistant's MQTT."""
+    async with ClientSession() as session:
+        service_configuration = ServiceConfiguration(session, ninja_service_host=fleet.ninja_service_host)
+        device = Appliance(fleet.controller_host(0), service_configuration, fleet.units[0].user(), session)
+        await device.init()
+        coordinator = SimpleNamespace(device=device, async_update_listeners=Mock(), async_request_refresh=AsyncMock())
+        entry = MockConfigEntry(domain=DOMAIN)
+        entry.add_to_hass(hass)
+        entry.runtime_data = coordinator
+        bridge = ActronMqttBridge(hass, entry, PREFIX)
+        assert await bridge.async_start()
+        await hass.async_block_till_done()
+        yield bridge
+        bridge.async_stop()
+        # the entry was not set up through the integration, its background tasks are cancelled here
+        await entry._async_process_on_unload(hass)
+
+
+async def test_state_is_published_retained(
+    hass: HomeAssistant, mqtt_mock: MqttMockHAClient, bridge: ActronMqttBridge
+) -> None:
+    """The whole state is published once, then the fields that change."""
+    base = bridge.base_topic
+    mqtt_mock.async_publish.assert_any_call(f"{base}/enabled_zones", "[1, 1]", 0, True)
+    mqtt_mock.async_publish.reset_mock()
+
+    await bridge.device.async_set_temperature(20.5)
+    await hass.async_block_till_done()
+
+    mqtt_mock.async_publish.assert_called_once_with(f"{base}/target_temperature", "20.5", 0, True)
+
+
+@pytest.mark.parametrize(
+    ("topic", "payload", "field", "value"),
+    [
+        ("is_on/set", "on", "isOn", True),
+        ("fan_speed/set", "high", "fanSpeed", 2),
+        ("target_temperature/set", "19.5", "setPoint", 19.5),
+        ("zone/1/set", "off", "enabledZones", [1, 0]),
+    ],
+)
+async def test_set_topics_are_subscribed(
+    hass: HomeAssistant, bridge: ActronMqttBridge, fleet: SimulatedFleet, topic, payload, field, value
+) -> None:
+    """Messages on the set topics reach the device."""
+    async_fire_mqtt_message(hass, f"{bridge.base_topic}/{topic}", payload)
+    await hass.async_block_till_done()
+
+    assert fleet.units[0].status[field] == value
+    bridge.coordinator.async_request_refresh.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "topic",
+    [
+        "{base}/target_temperature",
+        "{base}/zone/1/extra/set",
+        "{base}/zone/set",
+        "{prefix}/ACONNECT999999999999/target_temperature/set",
+    ],
+)
+async def test_other_topics_are_not_subscribed(
+    hass: HomeAssistant, bridge: ActronMqttBridge, fleet: SimulatedFleet, topic
+) -> None:
+    """Messages outside the set topics of the device are not handled."""
+    async_fire_mqtt_message(hass, topic.format(base=bridge.base_topic, prefix=PREFIX), "19.5")
+    await hass.async_block_till_done()
+
+    assert fleet.requests["command"] == 0
+    bridge.coordinator.async_request_refresh.assert_not_called()
+
+
+async def test_stopped_bridge_ignores_commands(
+    hass: HomeAssistant, bridge: ActronMqttBridge, fleet: SimulatedFleet
+) -> None:
+    """Stopping the bridge unsubscribes from the set topics."""
+    bridge.async_stop()
+    async_fire_mqtt_message(hass, f"{bridge.base_topic}/target_temperature/set", "19.5")
+    await hass.async_block_till_done()
+
+    assert fleet.requests["command"] == 0
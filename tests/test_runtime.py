@@ -0,0 +1,74 @@
+"""Tests for the runtime statistics accumulator."""
+
+from datetime import datetime, timedelta
+
+from pyactron.const import HVACAction, HVACMode
+from pyactron.runtime import RuntimeAccumulator
+
+START = datetime(2024, 1, 1, 10, 0)
+
+
+def _cool(accumulator: RuntimeAccumulator, timestamp: datetime, compressor=HVACAction.COOLING) -> None:
+    accumulator.add_sample(timestamp, True, HVACMode.COOL, compressor)
+
+
+def test_interval_crossing_an_hour_is_split():
+    accumulator = RuntimeAccumulator(max_gap=timedelta(minutes=5))
+    _cool(accumulator, START + timedelta(minutes=59))
+    _cool(accumulator, START + timedelta(hours=1, minutes=1))
+
+    [hour] = accumulator.pop_completed()
+    assert hour.start == START
+    assert hour.seconds["cooling"] == 60
+    assert hour.seconds["on_cool"] == 60
+    assert hour.seconds["heating"] == 0
+
+    # the hour after gets the rest of the interval once it completes
+    _cool(accumulator, START + timedelta(hours=2), HVACAction.IDLE)
+    [hour] = accumulator.pop_completed()
+    assert hour.start == START + timedelta(hours=1)
+    assert hour.seconds["cooling"] == 60
+
+
+def test_interval_spanning_several_hours_is_split_by_hour():
+    accumulator = RuntimeAccumulator(max_gap=timedelta(hours=3))
+    _cool(accumulator, START + timedelta(minutes=30))
+    _cool(accumulator, START + timedelta(hours=2, minutes=30))
+
+    hours = accumulator.pop_completed()
+    assert [hour.start for hour in hours] == [START, START + timedelta(hours=1)]
+    assert [hour.seconds["cooling"] for hour in hours] == [1800, 3600]
+
+
+def test_gap_longer_than_max_gap_is_not_counted():
+    accumulator = RuntimeAccumulator(max_gap=timedelta(minutes=5))
+    _cool(accumulator, START)
+    _cool(accumulator, START + timedelta(minutes=10))
+    _cool(accumulator, START + timedelta(minutes=11))
+    # the gap to the next hour is not counted either, but completes the hour
+    _cool(accumulator, START + timedelta(hours=1, minutes=30))
+
+    [hour] = accumulator.pop_completed()
+    assert hour.seconds["cooling"] == 60
+    assert hour.seconds["on_cool"] == 60
+
+
+def test_time_off_is_not_counted():
+    accumulator = RuntimeAccumulator(max_gap=timedelta(minutes=5))
+    accumulator.add_sample(START, False, HVACMode.OFF, HVACAction.IDLE)
+    accumulator.add_sample(START + timedelta(minutes=1), True, HVACMode.HEAT, HVACAction.HEATING)
+    accumulator.add_sample(START + timedelta(minutes=3), True, HVACMode.HEAT, HVACAction.IDLE)
+    accumulator.add_sample(START + timedelta(minutes=4), False, HVACMode.OFF, HVACAction.IDLE)
+    accumulator.add_sample(START + timedelta(hours=1), False, HVACMode.OFF, HVACAction.IDLE)
+
+    [hour] = accumulator.pop_completed()
+    assert hour.seconds == {
+        "heating": 120,
+        "cooling": 0,
+        "idle": 60,
+        "on_heat_cool": 0,
+        "on_heat": 180,
+        "on_cool": 0,
+        "on_fan_only": 0,
+    }
+    assert accumulator.pop_completed() == []
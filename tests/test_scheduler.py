@@ -0,0 +1,88 @@
+"""Tests for the request scheduler."""
+
+import asyncio
+
+import pytest
+
+from pyactron.const import RequestPriority
+from pyactron.exceptions import ActronRequestDropped
+from pyactron.scheduler import RequestScheduler
+
+
+async def _hold(scheduler: RequestScheduler, priority: RequestPriority, release: asyncio.Event) -> None:
+    async with scheduler.slot(priority):
+        await release.wait()
+
+
+def test_interactive_request_drops_waiting_poll():
+    async def run():
+        scheduler = RequestScheduler(max_concurrent=1, max_waiting=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(scheduler, RequestPriority.INTERACTIVE, release))
+        await asyncio.sleep(0)
+        poll = asyncio.create_task(_hold(scheduler, RequestPriority.POLL, release))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(_hold(scheduler, RequestPriority.INTERACTIVE, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ActronRequestDropped):
+            await poll
+        release.set()
+        await asyncio.gather(holder, interactive)
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler.dropped == 1
+    assert scheduler._active == 0
+    assert scheduler._active_droppable == 0
+
+
+def test_dropped_waiter_cancelled_does_not_release():
+    async def run():
+        scheduler = RequestScheduler(max_concurrent=1, max_waiting=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(scheduler, RequestPriority.INTERACTIVE, release))
+        await asyncio.sleep(0)
+        poll = asyncio.create_task(_hold(scheduler, RequestPriority.POLL, release))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(_hold(scheduler, RequestPriority.INTERACTIVE, release))
+        await asyncio.sleep(0)
+
+        # the poll is cancelled after being dropped, before it gets to run
+        poll.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await poll
+        assert scheduler._active == 1
+
+        release.set()
+        await asyncio.gather(holder, interactive)
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler._active == 0
+    assert scheduler._active_droppable == 0
+
+
+def test_cancelled_waiter_passes_slot_on():
+    async def run():
+        scheduler = RequestScheduler(max_concurrent=1, max_waiting=4)
+        release = asyncio.Event()
+        slot = scheduler.slot(RequestPriority.INTERACTIVE)
+        await slot.__aenter__()
+        first = asyncio.create_task(_hold(scheduler, RequestPriority.INTERACTIVE, release))
+        second = asyncio.create_task(_hold(scheduler, RequestPriority.INTERACTIVE, release))
+        await asyncio.sleep(0)
+
+        # the slot is handed over to the first waiter, which is cancelled before it runs
+        await slot.__aexit__(None, None, None)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert scheduler._active == 1
+
+        release.set()
+        await asyncio.wait_for(second, 1)
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert scheduler._active == 0
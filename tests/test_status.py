@@ -0,0 +1,84 @@
+"""Tests for the status updates of the appliance, against the simulator."""
+
+import asyncio
+
+from pyactron.const import RequestPriority
+
+from simulation import simulated_appliance
+
+
+def test_polls_wait_for_the_command_to_reach_the_device():
+    async def run():
+        async with simulated_appliance(propagation_delay=0.2) as (device, fleet):
+            await device.async_set_temperature(20.0)
+            reads = fleet.requests["status"]
+            await device.update_status()
+            return device, fleet.requests["status"] - reads
+
+    device, reads = asyncio.run(run())
+    assert reads == 0
+    assert device.target_temperature == 20.0
+
+
+def test_confirmations_read_through_the_skip_window():
+    async def run():
+        async with simulated_appliance(propagation_delay=0.2) as (device, fleet):
+            await device.async_set_temperature(20.0)
+            fleet.units[0].status["roomTemp_oC"] = 25.0
+            reads = fleet.requests["status"]
+            await device.update_status(RequestPriority.CONFIRMATION)
+            return device, fleet.requests["status"] - reads
+
+    device, reads = asyncio.run(run())
+    assert reads == 1
+    assert device.current_temperature == 25.0
+    # the device has not applied the command yet, the value sent is kept
+    assert device.target_temperature == 20.0
+
+
+def test_concurrent_updates_share_one_request():
+    async def run():
+        async with simulated_appliance() as (device, fleet):
+            reads = fleet.requests["status"]
+            await asyncio.gather(*(device.update_status() for _ in range(10)))
+            return fleet.requests["status"] - reads
+
+    assert asyncio.run(run()) == 1
+
+
+def test_more_urgent_update_does_not_wait_for_a_poll():
+    async def run():
+        async with simulated_appliance() as (device, fleet):
+            reads = fleet.requests["status"]
+            await asyncio.gather(
+                device.update_status(),
+                device.update_status(RequestPriority.INTERACTIVE),
+                device.update_status(),
+                device.update_status(RequestPriority.INTERACTIVE),
+            )
+            return fleet.requests["status"] - reads
+
+    assert asyncio.run(run()) == 2
+
+
+def test_stale_poll_does_not_overwrite_a_newer_status():
+    async def run():
+        async with simulated_appliance() as (device, fleet):
+            get_resource = device._get_resource
+
+            async def slow_polls(path, params=None, priority=RequestPriority.POLL):
+                response = await get_resource(path, params, priority=priority)
+                if priority == RequestPriority.POLL:
+                    await asyncio.sleep(0.2)
+                return response
+
+            device._get_resource = slow_polls
+            poll = asyncio.create_task(device.update_status())
+            await asyncio.sleep(0.1)
+            # the poll has read the fan speed, the confirmation reads the new one
+            fleet.units[0].status["fanSpeed"] = 2
+            await device.update_status(RequestPriority.CONFIRMATION)
+            await poll
+            return device
+
+    assert asyncio.run(run()).fan_speed == "high"
@@ -0,0 +1,41 @@
+"""Tests for watching the state of the appliance, against the simulator."""
+
+import asyncio
+
+from pyactron.simulator import Fault
+
+from simulation import simulated_appliance
+
+
+def test_slow_subscriber_keeps_every_changed_field():
+    async def run():
+        async with simulated_appliance() as (device, fleet):
+            watcher = device.watch(queue_size=1)
+            await anext(watcher)
+            await device.async_turn_on()
+            await device.async_set_temperature(19.0)
+            delta = await anext(watcher)
+            await watcher.aclose()
+            return delta
+
+    delta = asyncio.run(run())
+    # turning on also changes the mode from off
+    assert delta.changes == {"is_on": True, "mode": "cool", "target_temperature": 19.0}
+    assert delta.previous.is_on is False
+
+
+def test_polling_survives_an_invalid_status():
+    async def run():
+        async with simulated_appliance() as (device, fleet):
+            watcher = device.watch(poll_interval=0.05)
+            await anext(watcher)
+            fleet.faults["status"] = Fault(truncate=True)
+            await asyncio.sleep(0.2)
+            del fleet.faults["status"]
+            fleet.units[0].status["fanSpeed"] = 2
+            delta = await asyncio.wait_for(anext(watcher), 1)
+            await watcher.aclose()
+            return delta
+
+    delta = asyncio.run(run())
+    assert delta.changes == {"fan_speed": "high"}
@@ -0,0 +1,72 @@
+"""Tests for zone edits, against the simulator."""
+
+import asyncio
+
+import pytest
+
+from pyactron.exceptions import ActronException
+from pyactron.simulator import Fault
+
+from simulation import simulated_appliance
+
+
+def test_concurrent_zone_changes_are_merged():
+    async def run():
+        async with simulated_appliance(zone_count=4) as (device, fleet):
+            await asyncio.gather(
+                device.async_zone_turn_off(0),
+                device.async_zone_turn_off(1),
+                device.async_zone_turn_off(3),
+            )
+            return device, fleet
+
+    device, fleet = asyncio.run(run())
+    assert fleet.requests["command"] == 1
+    assert fleet.units[0].status["enabledZones"] == [0, 0, 1, 0]
+    assert device.enabled_zones == [0, 0, 1, 0]
+
+
+def test_zone_changes_during_a_command_are_sent_together():
+    async def run():
+        async with simulated_appliance(zone_count=4) as (device, fleet):
+            fleet.faults["command"] = Fault(delay=0.1)
+            first = asyncio.create_task(device.async_zone_turn_off(0))
+            await asyncio.sleep(0.05)
+            await asyncio.gather(device.async_zone_turn_off(1), device.async_zone_turn_off(2), first)
+            return fleet
+
+    fleet = asyncio.run(run())
+    assert fleet.requests["command"] == 2
+    assert fleet.units[0].status["enabledZones"] == [0, 0, 0, 1]
+
+
+def test_failed_zone_change_is_rolled_back():
+    async def run():
+        async with simulated_appliance(zone_count=2) as (device, fleet):
+            fleet.faults["command"] = Fault(status=403)
+            with pytest.raises(ActronException):
+                await device.async_zone_turn_off(0)
+            return device
+
+    device = asyncio.run(run())
+    assert device.enabled_zones == [1, 1]
+
+
+def test_cancelled_caller_does_not_drop_joined_changes():
+    async def run():
+        async with simulated_appliance(zone_count=4) as (device, fleet):
+            fleet.faults["command"] = Fault(delay=0.1)
+            # both changes go into the edit created by the owner
+            owner = asyncio.create_task(device.async_zone_turn_off(0))
+            joiner = asyncio.create_task(device.async_zone_turn_off(1))
+            await asyncio.sleep(0.05)
+            owner.cancel()
+            await joiner
+            with pytest.raises(asyncio.CancelledError):
+                await owner
+            return device, fleet
+
+    device, fleet = asyncio.run(run())
+    assert fleet.requests["command"] == 1
+    assert fleet.units[0].status["enabledZones"] == [0, 0, 1, 1]
+    assert device.enabled_zones == [0, 0, 1, 1]